@@ -246,7 +246,7 @@ def _serialize_object(
             for prop in obj_type.derived_properties:
                 derived[prop] = obj.get(prop)
         serialized["derived_properties"] = derived
-    if include_runtime_metadata and obj.runtime_metadata:
+    if include_runtime_metadata and obj.has_annotations:
         serialized["runtime_metadata"] = dict(obj.runtime_metadata)
     return serialized
 
@@ -427,7 +427,7 @@ def list_actions() -> list[dict[str, Any]]:
                     "api_name": action.api_name,
                     "display_name": action.display_name,
                     "description": action.description,
-                    "target_object_types": action.target_object_types,
+                    "target_object_types": sorted(action.target_object_types),
                     "parameters": [
                         {
                             "name": param.name,
@@ -199,7 +199,7 @@ def generate_demo_data(ontology: OptimizedOntology, product_count: int = 10000,
 
     # 更新客户订单统计
     print("Updating customer statistics...")
-    for customer in customers:
+    for i, customer in enumerate(customers):
         customer_orders = ontology.get_objects_of_type("Order").filter("customer_id", customer.primary_key_value)
         orders = customer_orders.all()
 
@@ -207,9 +207,10 @@ def generate_demo_data(ontology: OptimizedOntology, product_count: int = 10000,
             total_orders = len(orders)
             total_spent = sum(order.get("total_amount") for order in orders)
 
-            # 直接更新客户对象
-            customer.property_values["total_orders"] = total_orders
-            customer.property_values["total_spent"] = total_spent
+            # property_values 只读：生成更新后的副本并写回本体
+            customer = customer.with_values(total_orders=total_orders, total_spent=total_spent)
+            ontology.add_object(customer)
+            customers[i] = customer
 
     data_gen_time = time.time() - start_time
     print(f"Demo data generated in {data_gen_time:.2f} seconds")
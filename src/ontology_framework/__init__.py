@@ -1,4 +1,4 @@
-from .applications import ObjectExplorer, ObjectView, Quiver
+from .applications import AnalysisReport, ObjectExplorer, ObjectView, Quiver
 from .core import (
     ActionType,
     LinkType,
@@ -86,6 +86,7 @@ __all__ = [
     "ObjectView",
     "ObjectExplorer",
     "Quiver",
+    "AnalysisReport",
 
     # Permissions
     "PermissionType",
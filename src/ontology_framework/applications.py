@@ -1,5 +1,6 @@
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Deque, Dict, List, Optional
 
 from .core import ObjectInstance, ObjectSet, ObjectType, Ontology
 
@@ -19,7 +20,7 @@ def _object_snapshot(
                     props[derived_name] = obj.get(derived_name)
 
     snapshot = {"primary_key": obj.primary_key_value, "properties": props}
-    if obj.runtime_metadata:
+    if obj.has_annotations:
         snapshot["annotations"] = dict(obj.runtime_metadata)
     return snapshot
 
@@ -48,7 +49,7 @@ class VertexSimulation:
     ] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ObjectView:
     object_type: ObjectType
     title: str
@@ -159,15 +160,28 @@ class ObjectExplorer:
         return context_bundle
 
 
+@dataclass(frozen=True, slots=True)
+class AnalysisReport:
+    """Structured result of Quiver.analyze, so callers need not parse stdout."""
+
+    header: str
+    object_count: int
+    type_name: str
+
+
 class Quiver:
-    def analyze(self, object_set: ObjectSet):
-        print("--- Quiver Analysis ---")
-        print(
-            f"Analyzing {len(object_set.all())} objects of type {object_set.object_type.api_name}"
+    def analyze(self, object_set: ObjectSet) -> AnalysisReport:
+        report = AnalysisReport(
+            header="--- Quiver Analysis ---",
+            object_count=len(object_set.all()),
+            type_name=object_set.object_type.api_name,
         )
+        print(report.header)
+        print(f"Analyzing {report.object_count} objects of type {report.type_name}")
         # Mock analysis
         print("Generating charts... [Done]")
         print("-----------------------")
+        return report
 
 
 class Vertex:
@@ -231,16 +245,21 @@ class Vertex:
 
         nodes: Dict[str, Dict[str, Any]] = {}
         edges: List[Dict[str, Any]] = []
-        queue: List[tuple[ObjectInstance, int]] = []
+        queue: Deque[tuple[ObjectInstance, int]] = deque()
         visited: set[str] = set()
 
+        # Group links by type once instead of rescanning every link per node.
+        links_by_type: Dict[str, List[Any]] = {}
+        for link in self._ontology.get_all_links():
+            links_by_type.setdefault(link.link_type_api_name, []).append(link)
+
         for obj in seed_set.all():
             node_id = self._node_id(obj)
             nodes[node_id] = self._build_node_payload(obj, 0, include_properties)
             queue.append((obj, 0))
 
         while queue:
-            current_obj, depth = queue.pop(0)
+            current_obj, depth = queue.popleft()
             current_id = self._node_id(current_obj)
             if current_id in visited or depth > max_depth:
                 continue
@@ -249,10 +268,7 @@ class Vertex:
                 current_obj.object_type_api_name
             )
             for link_type in link_types:
-                for link in self._ontology.get_all_links():
-                    if link.link_type_api_name != link_type.api_name:
-                        continue
-
+                for link in links_by_type.get(link_type.api_name, ()):
                     neighbor, direction = self._resolve_neighbor(
                         current_obj, link, link_type
                     )
@@ -1,11 +1,38 @@
+from array import array
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional, Set, Type, Protocol
+import sys
+from types import MappingProxyType
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Protocol,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
 import uuid
+from weakref import WeakValueDictionary
+
+try:  # pragma: no cover - optional dependency
+    import numpy as np  # type: ignore
+except ImportError:  # pragma: no cover
+    np = None
 
 from .permissions import AccessControlList
 from .datasources import DataSourceAdapter, InMemoryDataSource, DataSourceError
 
+# Below this many values the NumPy conversion costs more than it saves.
+NUMPY_AGGREGATE_MIN_SIZE = 256
+
 
 class PropertyType(Enum):
     STRING = "string"
@@ -39,12 +66,60 @@ class ObjectSetTypeSpec(TypeSpec):
     object_type_api_name: str
 
 
-@dataclass
+# 结构相同的定义在大量 ObjectType 之间共享同一个实例（弱引用，不阻止回收）
+_PROPERTY_DEFINITIONS: "WeakValueDictionary[tuple, PropertyDefinition]" = (
+    WeakValueDictionary()
+)
+_ACTION_PARAMETERS: "WeakValueDictionary[tuple, ActionParameter]" = (
+    WeakValueDictionary()
+)
+
+
+def _coerce_property_type(value: Any) -> Any:
+    """Map ``"string"`` etc. to the PropertyType member; other values pass through."""
+    try:
+        return PropertyType(value)
+    except (ValueError, TypeError):
+        return value
+
+
+def _interned(cls: type, table: WeakValueDictionary, **fields: Any) -> Any:
+    """Return the shared instance for these (already normalized) field values.
+
+    Fields are set here, only when the instance is first created; the class's
+    ``__init__`` is a no-op so a later equal-but-not-identical call (``1`` vs
+    ``True``) cannot rewrite an instance that others already share.
+    """
+    key = (cls, *fields.values())
+    instance = table.get(key)
+    if instance is None:
+        instance = object.__new__(cls)
+        for name, value in fields.items():
+            object.__setattr__(instance, name, value)
+        table[key] = instance
+    return instance
+
+
+@dataclass(frozen=True, slots=True, weakref_slot=True, init=False)
 class PropertyDefinition:
     name: str
     type: PropertyType
     description: Optional[str] = None
 
+    def __new__(cls, name=None, type=None, description=None):
+        if name is None:  # copy/pickle 重建路径
+            return object.__new__(cls)
+        return _interned(
+            cls,
+            _PROPERTY_DEFINITIONS,
+            name=name,
+            type=_coerce_property_type(type),
+            description=description,
+        )
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        pass  # 字段已在 __new__ 中设置
+
 
 @dataclass
 class DerivedPropertyDefinition:
@@ -58,7 +133,15 @@ class DerivedPropertyDefinition:
     description: Optional[str] = None
 
 
-@dataclass
+# PropertyType -> 校验失败条件（v 为属性值）；bool 是 int 的子类，需单独排除
+_VALIDATOR_CHECKS: Dict[PropertyType, str] = {
+    PropertyType.STRING: "not isinstance(v, str)",
+    PropertyType.INTEGER: "(not isinstance(v, int) or isinstance(v, bool))",
+    PropertyType.BOOLEAN: "not isinstance(v, bool)",
+}
+
+
+@dataclass(slots=True)
 class ObjectType:
     api_name: str
     display_name: str
@@ -74,6 +157,16 @@ class ObjectType:
     title_property: Optional[str] = None
     icon: Optional[str] = "cube"
     permissions: Optional["AccessControlList"] = None
+    _compiled_validator: Optional[Callable[[Dict[str, Any]], bool]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _frozen: bool = field(default=False, init=False, repr=False, compare=False)
+    _property_items: Tuple[Tuple[str, PropertyDefinition], ...] = field(
+        default=(), init=False, repr=False, compare=False
+    )
+    _instance_template: Optional[Dict[str, Any]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def __post_init__(self):
         # 兼容 tests 中以位置参数传主键的写法（即第三个参数是 primary_key）
@@ -84,9 +177,108 @@ class ObjectType:
     def add_property(
         self, name: str, type: PropertyType, description: Optional[str] = None
     ):
+        if self._frozen:
+            raise ValueError(
+                f"Object type {self.api_name} is frozen after registration; "
+                f"cannot add property {name}"
+            )
         self.properties[name] = PropertyDefinition(name, type, description)
+        self._compiled_validator = None
+        self._instance_template = None
+        return self
+
+    def add_properties(
+        self,
+        spec: Union[Mapping[str, PropertyType], Iterable[Tuple[str, PropertyType]]],
+    ):
+        """Bulk add_property from a name -> type mapping or (name, type) pairs."""
+        if self._frozen:
+            raise ValueError(
+                f"Object type {self.api_name} is frozen after registration; "
+                f"cannot add properties"
+            )
+        items = spec.items() if isinstance(spec, Mapping) else spec
+        properties = self.properties
+        for name, type in items:
+            properties[name] = PropertyDefinition(name, type)
+        self._compiled_validator = None
+        self._instance_template = None
+        return self
+
+    def freeze(self) -> "ObjectType":
+        """Make the property schema read-only.
+
+        Called by Ontology.register_object_type.
+        """
+        if not self._frozen:
+            self.properties = MappingProxyType(dict(self.properties))
+            self._property_items = tuple(self.properties.items())
+            self._frozen = True
         return self
 
+    @property
+    def frozen(self) -> bool:
+        return self._frozen
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # MappingProxyType 不能 pickle/deepcopy，按普通 dict 导出；编译后的校验函数按需重建
+        state = {name: getattr(self, name) for name in self.__slots__}
+        state["properties"] = dict(self.properties)
+        state["_compiled_validator"] = None
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        for name, value in state.items():
+            setattr(self, name, value)
+        if self._frozen:
+            self.properties = MappingProxyType(self.properties)
+
+    def make_instance(
+        self, primary_key_value: Any, **property_values: Any
+    ) -> "ObjectInstance":
+        """Build an instance whose property_values follow the schema's key order.
+
+        Unset properties default to None and the primary key property is
+        filled from primary_key_value.
+        """
+        template = self._instance_template
+        if template is None:
+            template = self._instance_template = dict.fromkeys(self.properties)
+        if type(primary_key_value) is str:
+            primary_key_value = sys.intern(primary_key_value)
+        values = template.copy()
+        if self.primary_key in values:
+            values[self.primary_key] = primary_key_value
+        values.update(property_values)
+        return ObjectInstance(
+            self.api_name, primary_key_value, MappingProxyType(values)
+        )
+
+    def validate(self, property_values: Dict[str, Any]) -> bool:
+        """Check that every non-null value matches its declared property type.
+
+        Missing properties are allowed; DATE/TIMESTAMP values are not checked.
+        The checks are compiled into one straight-line function on first use
+        and recompiled after add_property.
+        """
+        if self._compiled_validator is None:
+            self._compiled_validator = self._compile_validator()
+        return self._compiled_validator(property_values)
+
+    def _compile_validator(self) -> Callable[[Dict[str, Any]], bool]:
+        lines = ["def _validate(pv):"]
+        items = self._property_items if self._frozen else self.properties.items()
+        for name, prop in items:
+            checks = _VALIDATOR_CHECKS.get(prop.type)
+            if checks is None:
+                continue
+            lines.append(f"    v = pv.get({name!r})")
+            lines.append(f"    if v is not None and {checks}: return False")
+        lines.append("    return True")
+        namespace: Dict[str, Any] = {}
+        exec("\n".join(lines), namespace)  # 源码只由属性名 repr 拼接而成
+        return namespace["_validate"]
+
     def add_derived_property(
         self,
         name: str,
@@ -100,13 +292,75 @@ class ObjectType:
         return self
 
 
-@dataclass
+@dataclass(slots=True, init=False)
 class ObjectInstance:
     object_type_api_name: str
     primary_key_value: Any
     property_values: Dict[str, Any] = field(default_factory=dict)
     _ontology: Optional["Ontology"] = field(default=None, repr=False, compare=False)
-    runtime_metadata: Dict[str, Any] = field(default_factory=dict, repr=False, compare=False)
+    # 多数实例从不标注，按需创建，省去每个实例一个空 dict
+    _runtime_metadata: Optional[Dict[str, Any]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __init__(
+        self,
+        object_type_api_name: str,
+        primary_key_value: Any,
+        property_values: Optional[Dict[str, Any]] = None,
+        _ontology: Optional["Ontology"] = None,
+        runtime_metadata: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        # 字符串主键驻留：存储、链接与 search_around 的 dict 以主键为键，相同主键共享同一对象
+        if type(primary_key_value) is str:
+            primary_key_value = sys.intern(primary_key_value)
+        # 创建时复制并冻结，调用方之后再改原 dict 不会影响实例；修改走 with_values
+        if type(property_values) is not MappingProxyType:
+            property_values = MappingProxyType(dict(property_values or ()))
+        self.object_type_api_name = object_type_api_name
+        self.primary_key_value = primary_key_value
+        self.property_values = property_values
+        self._ontology = _ontology
+        # runtime_metadata 仍可作为构造参数传入；不传时不分配
+        self._runtime_metadata = runtime_metadata
+
+    def with_values(self, **overrides: Any) -> "ObjectInstance":
+        """Return a copy of this instance with the given property values replaced."""
+        return ObjectInstance(
+            self.object_type_api_name,
+            self.primary_key_value,
+            MappingProxyType({**self.property_values, **overrides}),
+            self._ontology,
+            dict(self._runtime_metadata) if self._runtime_metadata else None,
+        )
+
+    @property
+    def runtime_metadata(self) -> Dict[str, Any]:
+        """Runtime annotations, allocated on first access."""
+        metadata = self._runtime_metadata
+        if metadata is None:
+            metadata = self._runtime_metadata = {}
+        return metadata
+
+    @runtime_metadata.setter
+    def runtime_metadata(self, value: Dict[str, Any]) -> None:
+        self._runtime_metadata = value
+
+    @property
+    def has_annotations(self) -> bool:
+        """True if any runtime metadata was written; never allocates."""
+        return bool(self._runtime_metadata)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = {name: getattr(self, name) for name in ObjectInstance.__slots__}
+        state["property_values"] = dict(self.property_values)
+        state.update(getattr(self, "__dict__", ()))
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        for name, value in state.items():
+            setattr(self, name, value)
+        self.property_values = MappingProxyType(self.property_values)
 
     def get(self, property_name: str) -> Any:
         # 1. Check standard properties
@@ -173,7 +427,8 @@ class ObjectInstance:
 
     def get_annotation(self, key: str, default: Any = None) -> Any:
         """Read runtime metadata that does not belong to schema properties."""
-        return self.runtime_metadata.get(key, default)
+        metadata = self._runtime_metadata
+        return metadata.get(key, default) if metadata else default
 
 
 @dataclass
@@ -201,28 +456,71 @@ class InMemoryLinkStore:
 
     def __init__(self):
         self._links: List[Link] = []
+        # 按链接类型分桶（保持插入顺序），按类型列出时不必扫描全部链接
+        self._by_type: Dict[str, List[Link]] = {}
 
     def list_links(self, link_type_api_name: Optional[str] = None) -> List[Link]:
         if not link_type_api_name:
             return list(self._links)
-        return [link for link in self._links if link.link_type_api_name == link_type_api_name]
+        return list(self._by_type.get(link_type_api_name, ()))
 
     def add_link(self, link: Link) -> None:
         self._links.append(link)
+        self._by_type.setdefault(link.link_type_api_name, []).append(link)
 
     def delete_link(self, link_type_api_name: str, source_pk: Any, target_pk: Any) -> None:
-        self._links = [
+        bucket = self._by_type.get(link_type_api_name)
+        if not bucket:
+            return
+        doomed = [
             l
-            for l in self._links
-            if not (
-                l.link_type_api_name == link_type_api_name
-                and l.source_primary_key == source_pk
-                and l.target_primary_key == target_pk
-            )
+            for l in bucket
+            if l.source_primary_key == source_pk and l.target_primary_key == target_pk
         ]
+        if not doomed:
+            return
+        self._by_type[link_type_api_name] = [l for l in bucket if l not in doomed]
+        self._links = [l for l in self._links if l not in doomed]
+
+
+def _int64_sum_fits(packed: Any) -> bool:
+    """np.sum on an int64 column wraps silently; only vectorize when even the
+    worst-case sum (largest magnitude times length) stays inside int64."""
+    bound = max(abs(packed.min().item()), abs(packed.max().item()))
+    return bound * packed.size < 2**63
+
+
+# aggregate() 的函数名 -> 归约；NumPy 列与普通列表各一张表，一次字典查找代替 if/elif 链
+_ARRAY_AGGREGATES: Dict[str, Callable[[Any], Any]] = {
+    "sum": lambda a: a.sum().item(),
+    "avg": lambda a: a.mean().item(),
+    "max": lambda a: a.max().item(),
+    "min": lambda a: a.min().item(),
+    "count": lambda a: a.size,
+}
+_LIST_AGGREGATES: Dict[str, Callable[[Any], Any]] = {
+    "sum": sum,
+    "avg": lambda v: sum(v) / len(v),
+    "max": max,
+    "min": min,
+    "count": len,
+}
 
 
 class ObjectSet:
+    __slots__ = (
+        "object_type",
+        "_objects",
+        "_ontology",
+        "_lazy",
+        "_query_filters",
+        "_lazy_limit",
+        "_snapshot",
+        "_indexes",
+        "_column_cache",
+        "_cache_version",
+    )
+
     def __init__(
         self,
         object_type: ObjectType,
@@ -238,6 +536,12 @@ class ObjectSet:
         self._lazy = lazy
         self._query_filters = dict(filters or {}) if lazy else {}
         self._lazy_limit = limit if lazy else None
+        self._snapshot: Optional[Tuple[ObjectInstance, ...]] = None
+        # property_name -> value -> matching objects, built lazily by filter()
+        self._indexes: Dict[str, Dict[Any, Tuple[ObjectInstance, ...]]] = {}
+        # property_name -> non-null values, built lazily by aggregate()
+        self._column_cache: Dict[str, Any] = {}
+        self._cache_version = self._values_version()
 
     def add(self, obj: ObjectInstance):
         if obj.object_type_api_name != self.object_type.api_name:
@@ -245,6 +549,21 @@ class ObjectSet:
                 f"Object type mismatch: expected {self.object_type.api_name}, got {obj.object_type_api_name}"
             )
         self._objects.append(obj)
+        self._snapshot = None
+        self._indexes.clear()
+        self._column_cache.clear()
+
+    def _values_version(self) -> int:
+        # 绑定的本体每提交一次对象修改递增一次；未绑定本体的集合只随 add() 失效
+        return getattr(self._ontology, "_values_version", 0)
+
+    def _sync_caches(self) -> None:
+        """Drop value-derived caches once the bound ontology commits modifications."""
+        version = self._values_version()
+        if self._cache_version != version:
+            self._indexes.clear()
+            self._column_cache.clear()
+            self._cache_version = version
 
     @property
     def ontology(self) -> Optional["Ontology"]:
@@ -264,10 +583,37 @@ class ObjectSet:
                 lazy=True,
             )
 
-        filtered_objects = [
-            obj for obj in self.all() if obj.property_values.get(property_name) == value
-        ]
-        return ObjectSet(self.object_type, filtered_objects, self._ontology)
+        self._sync_caches()
+        try:
+            index = self._indexes.get(property_name)
+            if index is None:
+                index = self._build_index(property_name)
+            matches = index.get(value, ())
+        except TypeError:
+            # 不可哈希的属性值无法走索引，退回线性扫描
+            matches = tuple(
+                obj
+                for obj in self.all()
+                if obj.property_values.get(property_name) == value
+            )
+        result = ObjectSet(self.object_type, matches, self._ontology)
+        # 桶本身就是该结果的快照，重复过滤同一取值时 all() 不必再复制
+        result._snapshot = matches
+        return result
+
+    def _build_index(self, property_name: str) -> Dict[Any, Tuple[ObjectInstance, ...]]:
+        """Bucket the set's objects by one property value for hash lookups.
+
+        Each bucket is kept as a tuple and reused as the snapshot of every
+        filter() result for that value. The index is dropped when objects are
+        added to the set or when the bound ontology commits a modify_object.
+        """
+        buckets: Dict[Any, List[ObjectInstance]] = {}
+        for obj in self.all():
+            buckets.setdefault(obj.property_values.get(property_name), []).append(obj)
+        index = {value: tuple(objs) for value, objs in buckets.items()}
+        self._indexes[property_name] = index
+        return index
 
     def search_around(
         self, link_type_api_name: str, limit: Optional[int] = None, **filters
@@ -305,27 +651,39 @@ class ObjectSet:
         target_objects: List[ObjectInstance] = []
         seen_target_pks: Set[Any] = set()
 
-        for link in self._ontology.get_all_links():
-            if link.link_type_api_name != link_type_api_name:
-                continue
-
-            source_obj: Optional[ObjectInstance] = None
-            target_obj: Optional[ObjectInstance] = None
+        # 先挑出与当前集合相连的链接，再按类型批量取另一端对象
+        forward = direction == "forward"
+        if forward:
+            links = [
+                link
+                for link in self._ontology.get_links(link_type_api_name)
+                if link.source_primary_key in current_obj_map
+            ]
+            others = self._ontology.get_objects(
+                link_type.target_object_type,
+                [link.target_primary_key for link in links],
+            )
+        else:
+            links = [
+                link
+                for link in self._ontology.get_links(link_type_api_name)
+                if link.target_primary_key in current_obj_map
+            ]
+            others = self._ontology.get_objects(
+                link_type.source_object_type,
+                [link.source_primary_key for link in links],
+            )
 
-            if direction == "forward" and link.source_primary_key in current_obj_map:
+        for link, other in zip(links, others):
+            if other is None:
+                continue
+            if forward:
                 source_obj = current_obj_map[link.source_primary_key]
-                target_obj = self._ontology.get_object(
-                    link_type.target_object_type, link.target_primary_key
-                )
-            elif direction == "reverse" and link.target_primary_key in current_obj_map:
-                source_obj = self._ontology.get_object(
-                    link_type.source_object_type, link.source_primary_key
-                )
+                target_obj = other
+            else:
+                source_obj = other
                 target_obj = current_obj_map[link.target_primary_key]
 
-            if not source_obj or not target_obj:
-                continue
-
             if not self._passes_link_validations(link_type, source_obj, target_obj):
                 continue
 
@@ -437,37 +795,97 @@ class ObjectSet:
         # Optional arguments are allowed to return None
         return None
 
-    def all(self) -> List[ObjectInstance]:
-        if self._lazy and self._ontology:
-            self._objects = self._ontology.scan_objects(
-                self.object_type.api_name, self._query_filters, self._lazy_limit
-            )
-            self._lazy = False
-            self._query_filters = {}
-            self._lazy_limit = None
-        return self._objects
+    def all(self) -> Tuple[ObjectInstance, ...]:
+        """Return an immutable snapshot of the set, cached until the next add()."""
+        if self._snapshot is None:
+            if self._lazy and self._ontology:
+                self._objects = self._ontology.scan_objects(
+                    self.object_type.api_name, self._query_filters, self._lazy_limit
+                )
+                self._lazy = False
+                self._query_filters = {}
+                self._lazy_limit = None
+            self._snapshot = tuple(self._objects)
+        return self._snapshot
+
+    def _column_values(self, property_name: str) -> Any:
+        """Collect the non-null values of one property, as a NumPy array when
+        NumPy is installed and the column is large and purely numeric.
+
+        Without NumPy, large columns declared INTEGER are cached as an
+        ``array('q')`` (8 bytes per value) instead of a list of int objects.
+        Like the filter index, the cache is dropped on add() and on committed
+        object modifications.
+        """
+        self._sync_caches()
+        cached = self._column_cache.get(property_name)
+        if cached is not None:
+            return cached
+
+        values: Any = [
+            value
+            for value in (obj.property_values.get(property_name) for obj in self.all())
+            if value is not None
+        ]
+        if len(values) >= NUMPY_AGGREGATE_MIN_SIZE:
+            if np is not None:
+                try:
+                    packed = np.asarray(values)
+                except (TypeError, ValueError):
+                    packed = None
+                # 只对整数/浮点列走向量化；bool、字符串、混合类型保持原语义
+                if packed is not None and packed.dtype.kind in "iuf":
+                    if packed.dtype.kind == "f" or _int64_sum_fits(packed):
+                        values = packed
+            else:
+                prop = self.object_type.properties.get(property_name)
+                if prop is not None and prop.type == PropertyType.INTEGER:
+                    try:
+                        values = array("q", values)
+                    except (TypeError, OverflowError):
+                        pass  # 混入非整数或超出 int64 时保留列表
+        self._column_cache[property_name] = values
+        return values
 
     def aggregate(self, property_name: str, function: str) -> float:
-        values = [
-            obj.property_values.get(property_name)
-            for obj in self.all()
-            if obj.property_values.get(property_name) is not None
-        ]
-        if not values:
+        values = self._column_values(property_name)
+        if not len(values):
             return 0.0
 
-        if function == "sum":
-            return sum(values)
-        elif function == "avg":
-            return sum(values) / len(values)
-        elif function == "max":
-            return max(values)
-        elif function == "min":
-            return min(values)
-        elif function == "count":
-            return len(values)
+        if np is not None and isinstance(values, np.ndarray):
+            reducer = _ARRAY_AGGREGATES.get(function)
         else:
+            reducer = _LIST_AGGREGATES.get(function)
+        if reducer is None:
             raise ValueError(f"Unknown aggregation function: {function}")
+        return reducer(values)
+
+    def aggregate_all(self, property_name: str) -> Dict[str, Any]:
+        """Compute sum/avg/max/min/count of one property together.
+
+        Equivalent to calling aggregate() once per function, but avg reuses
+        the sum and the column is looked up once.
+        """
+        values = self._column_values(property_name)
+        count = len(values)
+        if not count:
+            return dict.fromkeys(_LIST_AGGREGATES, 0.0)
+
+        if np is not None and isinstance(values, np.ndarray):
+            total = values.sum().item()
+            high = values.max().item()
+            low = values.min().item()
+        else:
+            total = sum(values)
+            high = max(values)
+            low = min(values)
+        return {
+            "sum": total,
+            "avg": total / count,
+            "max": high,
+            "min": low,
+            "count": count,
+        }
 
 
 @dataclass
@@ -482,13 +900,28 @@ class LinkType:
     scoring_function_api_name: Optional[str] = None
 
 
-@dataclass
+@dataclass(frozen=True, slots=True, weakref_slot=True, init=False)
 class ActionParameter:
     api_name: str
     data_type: PropertyType
     required: bool = True
     description: Optional[str] = None
 
+    def __new__(cls, api_name=None, data_type=None, required=True, description=None):
+        if api_name is None:  # copy/pickle 重建路径
+            return object.__new__(cls)
+        return _interned(
+            cls,
+            _ACTION_PARAMETERS,
+            api_name=api_name,
+            data_type=_coerce_property_type(data_type),
+            required=bool(required),
+            description=description,
+        )
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        pass  # 字段已在 __new__ 中设置
+
 
 @dataclass
 class ActionLog:
@@ -572,11 +1005,20 @@ class ActionContext:
     ):
         self._ontology.ensure_object_type_writable(object_instance.object_type_api_name)
 
-        # We need to modify the object in place OR replace it.
-        # Since ObjectInstance is a dataclass, it's mutable.
-        # But we want to defer execution until commit.
+        # property_values is frozen, so commit swaps in a new mapping on the
+        # same instance; references held elsewhere see the change.
+        # We want to defer execution until commit.
         def commit():
-            object_instance.property_values[property_name] = value
+            object_instance.property_values = MappingProxyType(
+                {**object_instance.property_values, property_name: value}
+            )
+            # 已入库的实例重新写回，数据源据此刷新按值建立的索引
+            ontology = self._ontology
+            ontology._values_version += 1
+            type_name = object_instance.object_type_api_name
+            stored = ontology.get_object(type_name, object_instance.primary_key_value)
+            if stored is object_instance:
+                ontology.add_object(object_instance)
 
         self._object_edits.append(commit)
         self._changes.append(
@@ -624,7 +1066,9 @@ class ActionContext:
         )
 
     def apply_changes(self):
-        for edit in self._object_edits:
+        # 提交后清空队列：重复 apply 不应重放已提交的 create，否则会用旧值覆盖后续修改
+        edits, self._object_edits = self._object_edits, []
+        for edit in edits:
             edit()
 
 
@@ -646,11 +1090,11 @@ class Webhook(SideEffect):
     payload_template: Optional[Dict[str, Any]] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ActionType:
     api_name: str
     display_name: str
-    target_object_types: List[str]
+    target_object_types: FrozenSet[str]
     parameters: Dict[str, ActionParameter] = field(default_factory=dict)
     logic: Optional[Callable[[ActionContext, Any], None]] = (
         None  # Function taking context and kwargs
@@ -662,6 +1106,10 @@ class ActionType:
     permissions: Optional["AccessControlList"] = None
     side_effects: List[SideEffect] = field(default_factory=list)
 
+    def __post_init__(self):
+        # 目标类型只做成员判断，存为 frozenset 以获得 O(1) 查找
+        self.target_object_types = frozenset(self.target_object_types)
+
     def add_parameter(
         self,
         name: str,
@@ -702,11 +1150,29 @@ class Function:
 
 
 class Ontology:
+    __slots__ = (
+        "object_types",
+        "link_types",
+        "action_types",
+        "functions",
+        "_object_store",
+        "_link_store",
+        "_datasources",
+        "_default_datasource_id",
+        "_memory_datasource",
+        "_values_version",
+        "get_object_type",
+        "get_link_type",
+        "get_action_type",
+        "get_function",
+    )
+
     def __init__(self):
         self.object_types: Dict[str, ObjectType] = {}
         self.link_types: Dict[str, LinkType] = {}
         self.action_types: Dict[str, ActionType] = {}
         self.functions: Dict[str, Function] = {}
+        self._bind_lookups()
         # Data Store for simulation
         self._object_store: Dict[str, Dict[Any, ObjectInstance]] = (
             {}
@@ -718,6 +1184,34 @@ class Ontology:
             self._object_store, adapter_id=self._default_datasource_id
         )
         self.register_datasource(self._memory_datasource)
+        # ActionContext 每提交一次对象修改递增，绑定本体的 ObjectSet 据此丢弃按值缓存
+        self._values_version = 0
+
+    def _bind_lookups(self) -> None:
+        # 注册表查询直接绑定到 dict.get，省去一层 Python 方法调用
+        self.get_object_type: Callable[[str], Optional[ObjectType]] = (
+            self.object_types.get
+        )
+        self.get_link_type: Callable[[str], Optional[LinkType]] = self.link_types.get
+        self.get_action_type: Callable[[str], Optional[ActionType]] = (
+            self.action_types.get
+        )
+        self.get_function: Callable[[str], Optional[Function]] = self.functions.get
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # 绑定的 dict.get 会被 deepcopy 原样共享，复制时丢弃并在 __setstate__ 中重新绑定
+        state = {
+            name: getattr(self, name)
+            for name in Ontology.__slots__
+            if not name.startswith("get_")
+        }
+        state.update(getattr(self, "__dict__", {}))
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        for name, value in state.items():
+            setattr(self, name, value)
+        self._bind_lookups()
 
     def register_datasource(self, adapter: DataSourceAdapter):
         self._datasources[adapter.id] = adapter
@@ -771,6 +1265,7 @@ class Ontology:
     def register_object_type(self, object_type: ObjectType):
         if not object_type.backing_datasource_id:
             object_type.backing_datasource_id = self._default_datasource_id
+        object_type.freeze()
         self.object_types[object_type.api_name] = object_type
         self._object_store.setdefault(object_type.api_name, {})
         print(f"Registered Object Type: {object_type.api_name}")
@@ -786,6 +1281,35 @@ class Ontology:
         datasource.upsert(obj_type, object_instance)
         object_instance._ontology = self
 
+    def add_objects(self, object_instances: Iterable[ObjectInstance]):
+        """Add many objects, resolving type, writability and datasource once per type.
+
+        All object types are checked before anything is written.
+        """
+        by_type: Dict[str, List[ObjectInstance]] = {}
+        for object_instance in object_instances:
+            by_type.setdefault(object_instance.object_type_api_name, []).append(
+                object_instance
+            )
+
+        batches = []
+        for type_name, instances in by_type.items():
+            obj_type = self.object_types.get(type_name)
+            if not obj_type:
+                raise ValueError(f"Unknown object type: {type_name}")
+            self._ensure_writable(obj_type)
+            batches.append((obj_type, instances))
+
+        for obj_type, instances in batches:
+            datasource = self._get_datasource_for_type(obj_type)
+            upsert_many = getattr(datasource, "upsert_many", None)
+            if upsert_many is not None:
+                upsert_many(obj_type, instances)
+            else:
+                for instance in instances:
+                    datasource.upsert(obj_type, instance)
+            self._attach_context_many(instances)
+
     def get_object(self, type_name: str, primary_key: Any) -> Optional[ObjectInstance]:
         obj_type = self.object_types.get(type_name)
         if not obj_type:
@@ -794,6 +1318,39 @@ class Ontology:
         obj = datasource.fetch_object(obj_type, primary_key)
         return self._attach_context(obj)
 
+    def contains_object(self, type_name: str, primary_key: Any) -> bool:
+        """Existence check that does not need the object itself."""
+        obj_type = self.object_types.get(type_name)
+        if not obj_type:
+            return False
+        datasource = self._get_datasource_for_type(obj_type)
+        contains = getattr(datasource, "contains", None)
+        if contains is not None:
+            return contains(obj_type, primary_key)
+        return datasource.fetch_object(obj_type, primary_key) is not None
+
+    def get_objects(
+        self, type_name: str, primary_keys: List[Any]
+    ) -> List[Optional[ObjectInstance]]:
+        """Look up many objects of one type, resolving its datasource once.
+
+        Returns one entry per key, None where the object does not exist.
+        """
+        obj_type = self.object_types.get(type_name)
+        if not obj_type:
+            return [None] * len(primary_keys)
+        datasource = self._get_datasource_for_type(obj_type)
+        fetch_objects = getattr(datasource, "fetch_objects", None)
+        if fetch_objects is not None:
+            objects = fetch_objects(obj_type, primary_keys)
+        else:
+            fetch_object = datasource.fetch_object
+            objects = [fetch_object(obj_type, pk) for pk in primary_keys]
+        for obj in objects:
+            if obj is not None:
+                obj._ontology = self
+        return objects
+
     def delete_object(self, type_name: str, primary_key: Any):
         obj_type = self.object_types.get(type_name)
         if not obj_type:
@@ -815,8 +1372,20 @@ class Ontology:
         objects = list(datasource.scan(obj_type, filters=filters, limit=limit))
         return self._attach_context_many(objects)
 
-    def get_objects_of_type(self, type_name: str) -> List[ObjectInstance]:
-        return self.scan_objects(type_name)
+    def get_objects_of_type(self, type_name: str) -> Sequence[ObjectInstance]:
+        """All objects of a type.
+
+        Datasources exposing ``list_all`` return an immutable snapshot that is
+        reused until the type is next written, so repeated calls are O(1).
+        """
+        obj_type = self.object_types.get(type_name)
+        if not obj_type:
+            return ()
+        datasource = self._get_datasource_for_type(obj_type)
+        list_all = getattr(datasource, "list_all", None)
+        if list_all is None:
+            return self.scan_objects(type_name)
+        return list_all(obj_type)
 
     def build_object_set(
         self,
@@ -907,18 +1476,6 @@ class Ontology:
 
         return func_def.logic(**kwargs)
 
-    def get_object_type(self, api_name: str) -> Optional[ObjectType]:
-        return self.object_types.get(api_name)
-
-    def get_link_type(self, api_name: str) -> Optional[LinkType]:
-        return self.link_types.get(api_name)
-
-    def get_action_type(self, api_name: str) -> Optional[ActionType]:
-        return self.action_types.get(api_name)
-
-    def get_function(self, api_name: str) -> Optional[Function]:
-        return self.functions.get(api_name)
-
     def create_link(
         self,
         link_type_api_name: str,
@@ -982,6 +1539,10 @@ class Ontology:
     def get_all_links(self) -> List[Link]:
         return self._link_store.list_links()
 
+    def get_links(self, link_type_api_name: str) -> List[Link]:
+        """Links of one type, in creation order."""
+        return self._link_store.list_links(link_type_api_name)
+
     def get_link_types_for_object(self, object_type_api_name: str) -> List[LinkType]:
         """Return every LinkType touching the given object type (any direction)."""
         return [
@@ -1040,7 +1601,7 @@ class Ontology:
                 "api_name": at.api_name,
                 "display_name": at.display_name,
                 "description": at.description,
-                "targets": at.target_object_types,
+                "targets": sorted(at.target_object_types),
                 "parameters": [
                     {
                         "name": p.api_name,
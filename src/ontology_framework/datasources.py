@@ -57,26 +57,61 @@ class InMemoryDataSource:
         self._storage = storage
         self.id = adapter_id
         self.read_only = False
+        # 按类型缓存的不可变对象快照，读时构建；该类型任何写入都会丢弃，下次读取按插入顺序重建
+        self._snapshots: Dict[str, Tuple["ObjectInstance", ...]] = {}
+        # 类型 -> 属性 -> 取值 -> 对象列表，带过滤的 scan 按哈希取桶；该类型任何写入都会使其失效
+        self._indexes: Dict[str, Dict[str, Dict[Any, List["ObjectInstance"]]]] = {}
 
     def fetch_object(self, object_type: "ObjectType", primary_key: Any) -> Optional["ObjectInstance"]:
         return self._storage.get(object_type.api_name, {}).get(primary_key)
 
+    def contains(self, object_type: "ObjectType", primary_key: Any) -> bool:
+        return primary_key in self._storage.get(object_type.api_name, ())
+
+    def fetch_objects(
+        self, object_type: "ObjectType", primary_keys: Iterable[Any]
+    ) -> List[Optional["ObjectInstance"]]:
+        """批量按主键取对象，类型桶只查一次。"""
+        get = self._storage.get(object_type.api_name, {}).get
+        return [get(pk) for pk in primary_keys]
+
     def scan(
         self,
         object_type: "ObjectType",
         filters: Optional[Dict[str, Any]] = None,
         limit: Optional[int] = None,
     ) -> Iterable["ObjectInstance"]:
-        items = list(self._storage.get(object_type.api_name, {}).values())
-        if filters:
+        api_name = object_type.api_name
+        if not filters:
+            items = list(self._storage.get(api_name, {}).values())
+            return items if limit is None else items[:limit]
+
+        (first_key, first_value), *rest = filters.items()
+        try:
+            items = self._value_index(api_name, first_key).get(first_value, [])
+        except TypeError:
+            # 不可哈希的属性值无法走索引，退回线性扫描
+            items = list(self._storage.get(api_name, {}).values())
+            rest = list(filters.items())
+        if rest:
             items = [
                 obj
                 for obj in items
-                if all(obj.property_values.get(k) == v for k, v in filters.items())
+                if all(obj.property_values.get(k) == v for k, v in rest)
             ]
-        if limit is not None:
-            items = items[:limit]
-        return items
+        return items[:limit] if limit is not None else list(items)
+
+    def _value_index(
+        self, api_name: str, property_name: str
+    ) -> Dict[Any, List["ObjectInstance"]]:
+        type_indexes = self._indexes.setdefault(api_name, {})
+        index = type_indexes.get(property_name)
+        if index is None:
+            index = {}
+            for obj in self._storage.get(api_name, {}).values():
+                index.setdefault(obj.property_values.get(property_name), []).append(obj)
+            type_indexes[property_name] = index
+        return index
 
     def aggregate(
         self,
@@ -105,11 +140,41 @@ class InMemoryDataSource:
             return float(len(values))
         raise ValueError(f"Unsupported aggregation function: {function}")
 
+    def list_all(self, object_type: "ObjectType") -> Tuple["ObjectInstance", ...]:
+        """返回该类型全部对象的不可变快照；两次写入之间的重复调用返回同一元组。"""
+        api_name = object_type.api_name
+        snapshot = self._snapshots.get(api_name)
+        if snapshot is None:
+            snapshot = self._snapshots[api_name] = tuple(
+                self._storage.get(api_name, {}).values()
+            )
+        return snapshot
+
     def upsert(self, object_type: "ObjectType", instance: "ObjectInstance") -> None:
-        self._storage.setdefault(object_type.api_name, {})[instance.primary_key_value] = instance
+        api_name = object_type.api_name
+        bucket = self._storage.setdefault(api_name, {})
+        primary_key = instance.primary_key_value
+        previous = bucket.get(primary_key)
+        bucket[primary_key] = instance
+        self._indexes.pop(api_name, None)
+        if previous is not instance:
+            self._snapshots.pop(api_name, None)
+
+    def upsert_many(
+        self, object_type: "ObjectType", instances: Iterable["ObjectInstance"]
+    ) -> None:
+        """批量写入，单次 dict.update 代替逐条赋值。"""
+        self._storage.setdefault(object_type.api_name, {}).update(
+            (instance.primary_key_value, instance) for instance in instances
+        )
+        self._snapshots.pop(object_type.api_name, None)
+        self._indexes.pop(object_type.api_name, None)
 
     def delete(self, object_type: "ObjectType", primary_key: Any) -> None:
-        self._storage.get(object_type.api_name, {}).pop(primary_key, None)
+        removed = self._storage.get(object_type.api_name, {}).pop(primary_key, None)
+        if removed is not None:
+            self._snapshots.pop(object_type.api_name, None)
+            self._indexes.pop(object_type.api_name, None)
 
 
 @dataclass
@@ -231,10 +296,33 @@ class DuckDBDataSource:
         config = self._config_for(object_type)
         columns = list(config.column_mapping.values())
         placeholders = ", ".join(["?"] * len(columns))
-        sql = f"INSERT OR REPLACE INTO {config.table} ({', '.join(columns)}) VALUES ({placeholders})"
+        sql = (
+            f"INSERT OR REPLACE INTO {config.table} ({', '.join(columns)}) "
+            f"VALUES ({placeholders})"
+        )
         values = [instance.property_values.get(prop) for prop in config.column_mapping.keys()]
         self._conn.execute(sql, values)
 
+    def upsert_many(
+        self, object_type: "ObjectType", instances: Iterable["ObjectInstance"]
+    ) -> None:
+        if self.read_only:
+            raise DataSourceError("DuckDBDataSource 当前为只读，无法写入")
+        config = self._config_for(object_type)
+        columns = list(config.column_mapping.values())
+        placeholders = ", ".join(["?"] * len(columns))
+        sql = (
+            f"INSERT OR REPLACE INTO {config.table} ({', '.join(columns)}) "
+            f"VALUES ({placeholders})"
+        )
+        props = list(config.column_mapping.keys())
+        rows = [
+            [instance.property_values.get(prop) for prop in props]
+            for instance in instances
+        ]
+        if rows:
+            self._conn.executemany(sql, rows)
+
     def delete(self, object_type: "ObjectType", primary_key: Any) -> None:
         if self.read_only:
             raise DataSourceError("DuckDBDataSource 当前为只读，无法删除")
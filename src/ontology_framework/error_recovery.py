@@ -44,6 +44,7 @@ class CircuitBreakerConfig:
     recovery_timeout: float = 60.0  # 恢复超时（秒）
     expected_exception: Type[Exception] = Exception
     success_threshold: int = 3     # 成功阈值（半开状态）
+    time_fn: Optional[Callable[[], float]] = None  # 单调时钟，默认 time.monotonic，测试可注入
 
 
 class CircuitBreakerState(Enum):
@@ -71,6 +72,8 @@ class CircuitBreaker:
         self.failure_count = 0
         self.success_count = 0
         self.last_failure_time: Optional[datetime] = None
+        self._last_failure_at: Optional[float] = None
+        self._now = config.time_fn or time.monotonic
         self._lock = threading.Lock()
 
     def call(self, func: Callable, *args, **kwargs) -> Any:
@@ -103,17 +106,15 @@ class CircuitBreaker:
 
     def _should_attempt_reset(self) -> bool:
         """判断是否应该尝试重置熔断器"""
-        if self.last_failure_time is None:
+        if self._last_failure_at is None:
             return True
-        time_since_failure = datetime.now() - self.last_failure_time
-        return time_since_failure.total_seconds() >= self.config.recovery_timeout
+        return self._now() - self._last_failure_at >= self.config.recovery_timeout
 
     def _get_time_until_retry(self) -> float:
         """获取距离下次重试的时间"""
-        if self.last_failure_time is None:
+        if self._last_failure_at is None:
             return 0.0
-        time_since_failure = datetime.now() - self.last_failure_time
-        remaining = self.config.recovery_timeout - time_since_failure.total_seconds()
+        remaining = self.config.recovery_timeout - (self._now() - self._last_failure_at)
         return max(0.0, remaining)
 
     def _on_success(self):
@@ -133,6 +134,7 @@ class CircuitBreaker:
         with self._lock:
             self.failure_count += 1
             self.last_failure_time = datetime.now()
+            self._last_failure_at = self._now()
 
             if self.state == CircuitBreakerState.HALF_OPEN:
                 self.state = CircuitBreakerState.OPEN
@@ -151,6 +153,10 @@ class RetryMechanism:
 
     def execute_with_retry(self, func: Callable, *args, **kwargs) -> Any:
         """执行函数并在失败时重试"""
+        # 快速路径：不重试时直接调用，省去循环和异常处理开销；异常原样抛出，与慢路径一致
+        if self.config.max_attempts == 1 and not self.config.retry_on:
+            return func(*args, **kwargs)
+
         last_exception = None
 
         for attempt in range(self.config.max_attempts):
@@ -313,17 +319,26 @@ class ErrorRecoveryManager:
         self.fallback_handlers: Dict[str, FallbackHandler] = {}
 
     def register_circuit_breaker(self, name: str, config: CircuitBreakerConfig):
-        """注册熔断器"""
+        """注册熔断器；同名且配置相同时保留已有实例"""
+        existing = self.circuit_breakers.get(name)
+        if existing is not None and existing.config == config:
+            return
         self.circuit_breakers[name] = CircuitBreaker(config)
         main_logger.info(f"Registered circuit breaker: {name}")
 
     def register_retry_mechanism(self, name: str, config: RetryConfig):
-        """注册重试机制"""
+        """注册重试机制；同名且配置相同时保留已有实例"""
+        existing = self.retry_mechanisms.get(name)
+        if existing is not None and existing.config == config:
+            return
         self.retry_mechanisms[name] = RetryMechanism(config)
         main_logger.info(f"Registered retry mechanism: {name}")
 
     def register_fallback_handler(self, name: str, config: FallbackConfig):
-        """注册降级处理器"""
+        """注册降级处理器；同名且配置相同时保留已有实例"""
+        existing = self.fallback_handlers.get(name)
+        if existing is not None and existing.config == config:
+            return
         self.fallback_handlers[name] = FallbackHandler(config)
         main_logger.info(f"Registered fallback handler: {name}")
 
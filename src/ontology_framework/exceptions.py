@@ -2,7 +2,7 @@
 # 提供结构化的异常类层次和错误处理机制
 
 from enum import Enum
-from typing import Any, Dict, Optional, List
+from typing import Any, Dict, Optional, List, Tuple
 import traceback
 from datetime import datetime
 
@@ -389,15 +389,28 @@ class ErrorCollector:
     def __init__(self):
         self.errors: List[OntologyError] = []
         self.warnings: List[OntologyError] = []
+        # 过滤索引：key -> (errors 中的命中, warnings 中的命中)，拼接后与 get_all 顺序一致
+        self._by_category: Dict[
+            ErrorCategory, Tuple[List[OntologyError], List[OntologyError]]
+        ] = {}
+        self._by_severity: Dict[
+            ErrorSeverity, Tuple[List[OntologyError], List[OntologyError]]
+        ] = {}
+
+    def _index(self, error: OntologyError, slot: int):
+        self._by_category.setdefault(error.category, ([], []))[slot].append(error)
+        self._by_severity.setdefault(error.severity, ([], []))[slot].append(error)
 
     def add_error(self, error: OntologyError):
         """添加错误"""
         self.errors.append(error)
+        self._index(error, 0)
 
     def add_warning(self, warning: OntologyError):
         """添加警告"""
         warning.severity = ErrorSeverity.LOW
         self.warnings.append(warning)
+        self._index(warning, 1)
 
     def has_errors(self) -> bool:
         """是否有错误"""
@@ -413,16 +426,20 @@ class ErrorCollector:
 
     def get_by_severity(self, severity: ErrorSeverity) -> List[OntologyError]:
         """按严重程度获取错误"""
-        return [e for e in self.get_all() if e.severity == severity]
+        hits = self._by_severity.get(severity)
+        return hits[0] + hits[1] if hits else []
 
     def get_by_category(self, category: ErrorCategory) -> List[OntologyError]:
         """按分类获取错误"""
-        return [e for e in self.get_all() if e.category == category]
+        hits = self._by_category.get(category)
+        return hits[0] + hits[1] if hits else []
 
     def clear(self):
         """清空所有错误和警告"""
         self.errors.clear()
         self.warnings.clear()
+        self._by_category.clear()
+        self._by_severity.clear()
 
     def to_dict_list(self) -> List[Dict[str, Any]]:
         """转换为字典列表"""
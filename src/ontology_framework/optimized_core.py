@@ -308,14 +308,11 @@ class OptimizedObjectSet:
     ) -> Set[Any]:
         """传统的搜索周围方法（回退方案）"""
         related_target_pks = set()
-        all_links = self._ontology.get_all_links()
-
-        for link in all_links:
-            if link.link_type_api_name == link_type_api_name:
-                if direction == "forward" and link.source_primary_key in current_pks:
-                    related_target_pks.add(link.target_primary_key)
-                elif direction == "reverse" and link.target_primary_key in current_pks:
-                    related_target_pks.add(link.source_primary_key)
+        for link in self._ontology.get_links(link_type_api_name):
+            if direction == "forward" and link.source_primary_key in current_pks:
+                related_target_pks.add(link.target_primary_key)
+            elif direction == "reverse" and link.target_primary_key in current_pks:
+                related_target_pks.add(link.source_primary_key)
 
         return related_target_pks
 
@@ -445,6 +442,11 @@ class OptimizedOntology(BaseOntology):
 
             self.operation_stats["objects_created"] += 1
 
+    def add_objects(self, object_instances):
+        """批量添加对象，逐个走索引与缓存逻辑"""
+        for object_instance in object_instances:
+            self.add_object(object_instance)
+
     def get_object(
         self, type_name: str, primary_key: Any
     ) -> Optional[OptimizedObjectInstance]:
@@ -1,13 +1,23 @@
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import List, Optional
+from typing import Iterable, List
 
 
 class PermissionType(Enum):
-    VIEW = "view"
-    EDIT = "edit"
-    DELETE = "delete"
-    OWNER = "owner"
+    # 每种权限占用一个固定的位，AccessControlList 以位掩码记录授权；
+    # 位在成员创建时写入实例，grant/check 直接读属性，不查表
+    VIEW = ("view", 1 << 0)
+    EDIT = ("edit", 1 << 1)
+    DELETE = ("delete", 1 << 2)
+    OWNER = ("owner", 1 << 3)
+
+    bit: int
+
+    def __new__(cls, value: str, bit: int) -> "PermissionType":
+        member = object.__new__(cls)
+        member._value_ = value
+        member.bit = bit
+        return member
 
 
 @dataclass
@@ -21,12 +31,46 @@ class Principal:
 class AccessControlList:
     # simple mapping of principal_id -> list of permissions
     permissions: dict[str, List[PermissionType]] = field(default_factory=dict)
+    # principal_id -> permission bitmask, so grant dedup and check are O(1)
+    _masks: dict[str, int] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        for principal_id, perms in self.permissions.items():
+            mask = 0
+            for perm in perms:
+                mask |= perm.bit
+            self._masks[principal_id] = mask
 
     def grant(self, principal_id: str, permission: PermissionType):
-        if principal_id not in self.permissions:
-            self.permissions[principal_id] = []
-        if permission not in self.permissions[principal_id]:
-            self.permissions[principal_id].append(permission)
+        bit = permission.bit
+        mask = self._masks.get(principal_id, 0)
+        if mask & bit:
+            return
+        self._masks[principal_id] = mask | bit
+        self.permissions.setdefault(principal_id, []).append(permission)
 
     def check(self, principal_id: str, permission: PermissionType) -> bool:
-        return permission in self.permissions.get(principal_id, [])
+        return bool(self._masks.get(principal_id, 0) & permission.bit)
+
+    def check_all(
+        self, principal_id: str, permissions: Iterable[PermissionType]
+    ) -> bool:
+        """True if the principal holds every permission (one mask lookup)."""
+        required = 0
+        for perm in permissions:
+            required |= perm.bit
+        return self._masks.get(principal_id, 0) & required == required
+
+    def check_each(
+        self, principal_id: str, permissions: Iterable[PermissionType]
+    ) -> List[bool]:
+        """Per-permission results for one principal, with a single mask lookup."""
+        mask = self._masks.get(principal_id, 0)
+        return [bool(mask & perm.bit) for perm in permissions]
+
+    def clear(self):
+        """Revoke every grant."""
+        self.permissions.clear()
+        self._masks.clear()
@@ -1,6 +1,6 @@
 import time
 import uuid
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
 from .core import (
     ActionContext,
@@ -22,6 +22,16 @@ class ObjectSetService:
         self._storage: Dict[str, List[ObjectInstance]] = {}
         # Mock index: object_type_api_name -> property_name -> value -> List[ObjectInstance]
         self._index: Dict[str, Dict[str, Dict[Any, List[ObjectInstance]]]] = {}
+        # Search text: object_type_api_name -> lowercased property strings,
+        # parallel to _storage
+        self._search_text: Dict[str, List[str]] = {}
+
+    @staticmethod
+    def _to_search_text(obj: ObjectInstance) -> str:
+        # "\x00" 作分隔，子串匹配不会跨越两个属性值；
+        # property_values 只读，就地改不了；ActionContext.modify_object 会整体替换映射，
+        # 那之后需要重新索引
+        return "\x00".join(str(val).lower() for val in obj.property_values.values())
 
     def index_object(self, obj: ObjectInstance):
         """Simulates Object Storage V2 indexing."""
@@ -29,8 +39,10 @@ class ObjectSetService:
         if api_name not in self._storage:
             self._storage[api_name] = []
             self._index[api_name] = {}
+            self._search_text[api_name] = []
 
         self._storage[api_name].append(obj)
+        self._search_text[api_name].append(self._to_search_text(obj))
 
         # Simple indexing for all properties
         for prop, value in obj.property_values.items():
@@ -40,6 +52,26 @@ class ObjectSetService:
                 self._index[api_name][prop][value] = []
             self._index[api_name][prop][value].append(obj)
 
+    def index_objects(self, objs: Iterable[ObjectInstance]):
+        """Bulk variant of index_object with the storage and index lookups hoisted."""
+        storage = self._storage
+        index = self._index
+        search_text = self._search_text
+        to_search_text = self._to_search_text
+        for obj in objs:
+            api_name = obj.object_type_api_name
+            bucket = storage.get(api_name)
+            if bucket is None:
+                bucket = storage[api_name] = []
+                index[api_name] = {}
+                search_text[api_name] = []
+            bucket.append(obj)
+            search_text[api_name].append(to_search_text(obj))
+
+            type_index = index[api_name]
+            for prop, value in obj.property_values.items():
+                type_index.setdefault(prop, {}).setdefault(value, []).append(obj)
+
     def get_base_object_set(
         self, object_type: ObjectType, principal_id: str = None
     ) -> ObjectSet:
@@ -54,20 +86,23 @@ class ObjectSetService:
         objects = self._storage.get(object_type.api_name, [])
         return ObjectSet(object_type, objects)
 
+    def filter_by(self, object_type: ObjectType, prop: str, value: Any) -> ObjectSet:
+        """Exact-match lookup served from the property index built by index_object."""
+        objects = self._index.get(object_type.api_name, {}).get(prop, {}).get(value, [])
+        return ObjectSet(object_type, objects)
+
     def search(self, object_type: ObjectType, query: str) -> ObjectSet:
         """Semantic search simulation."""
         # In a real system, this would use embeddings/vector search.
-        # Here we just do a naive string match across all properties.
-        all_objects = self._storage.get(object_type.api_name, [])
-        results = []
-        for obj in all_objects:
-            match = False
-            for val in obj.property_values.values():
-                if str(val).lower().find(query.lower()) != -1:
-                    match = True
-                    break
-            if match:
-                results.append(obj)
+        # Here we do a case-insensitive substring match across all properties,
+        # against the lowercased text captured by index_object.
+        api_name = object_type.api_name
+        needle = query.lower()
+        if "\x00" in needle:
+            return ObjectSet(object_type, [])
+        objects = self._storage.get(api_name, [])
+        texts = self._search_text.get(api_name, [])
+        results = [obj for obj, text in zip(objects, texts) if needle in text]
         return ObjectSet(object_type, results)
 
 
@@ -7,6 +7,7 @@ Ontology Framework 测试配置文件
 import shutil
 import tempfile
 import time
+import uuid
 from pathlib import Path
 from typing import Any, Dict, Generator, List
 from unittest.mock import MagicMock, Mock
@@ -437,6 +438,13 @@ def benchmark_timer():
     return BenchmarkTimer()
 
 
+@pytest.fixture
+def frozen_time_uuid(monkeypatch):
+    """固定 time.time 与 uuid.uuid4（直接替换属性，不创建 Mock）"""
+    monkeypatch.setattr(time, "time", lambda: 1234567890)
+    monkeypatch.setattr(uuid, "uuid4", lambda: "action-uuid-123")
+
+
 @pytest.fixture(autouse=True)
 def cleanup_function_registry():
     """自动清理函数注册表"""
@@ -512,7 +512,7 @@ class PerformanceBenchmark:
         # 批量更新（模拟）
         try:
             for obj in all_objects[:100]:  # 更新前100个对象
-                obj.property_values["status"] = "updated"
+                ontology.add_object(obj.with_values(status="updated"))
             success_count += 100
         except Exception:
             error_count += 100
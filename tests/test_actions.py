@@ -1,5 +1,7 @@
 import unittest
 
+import pytest
+
 from ontology_framework.core import (
     ActionType,
     ObjectInstance,
@@ -10,6 +12,9 @@ from ontology_framework.core import (
 from ontology_framework.permissions import AccessControlList, PermissionType, Principal
 from ontology_framework.services import ActionService
 
+# 无共享状态，可由 pytest -n auto --dist loadgroup 分配到独立 worker
+pytestmark = pytest.mark.xdist_group(name="actions")
+
 
 class TestActionCapabilities(unittest.TestCase):
     def setUp(self):
@@ -83,6 +88,10 @@ class TestActionCapabilities(unittest.TestCase):
             "Factory", "F_MOD_1", {"factory_id": "F_MOD_1", "capacity": 100}
         )
         self.ontology.add_object(f1)
+        # 先按容量过滤一次，让数据源建立按值索引
+        self.assertEqual(
+            self.ontology.scan_objects("Factory", {"capacity": 100}), [f1]
+        )
 
         # Define Modify Logic
         def update_capacity_logic(context, factory_id, new_capacity):
@@ -112,6 +121,8 @@ class TestActionCapabilities(unittest.TestCase):
         # Verify
         obj = self.ontology.get_object("Factory", "F_MOD_1")
         self.assertEqual(obj.get("capacity"), 200)
+        self.assertEqual(self.ontology.scan_objects("Factory", {"capacity": 100}), [])
+        self.assertEqual(self.ontology.scan_objects("Factory", {"capacity": 200}), [obj])
 
     def test_parameter_validation(self):
         action = ActionType(
@@ -1,9 +1,9 @@
 # Applications 模块扩展测试
 # 专门用于提升 applications.py 的测试覆盖率
 
+import re
+
 import pytest
-from unittest.mock import Mock, patch
-import io
 
 from ontology_framework.applications import (
     ObjectView,
@@ -24,6 +24,21 @@ from ontology_framework.core import (
     PropertyType,
 )
 
+# 无共享状态，可由 pytest -n auto --dist loadgroup 分配到独立 worker
+pytestmark = pytest.mark.xdist_group(name="applications")
+
+_EXPECTED_VIEW_OUTPUT = (
+    "--- Object View: 产品视图 ---",
+    "Object Type: Test Product",
+    "Total Objects: 2",
+    "Widgets:",
+    "- [Widget] 表格",
+    "- [Widget] 图表",
+    "- [Widget] 过滤器",
+    "-------------------------------",
+)
+_EXPECTED_VIEW_PATTERN = re.compile("|".join(map(re.escape, _EXPECTED_VIEW_OUTPUT)))
+
 
 class TestObjectViewExtended:
     """ObjectView 扩展测试用例"""
@@ -86,39 +101,31 @@ class TestObjectViewExtended:
 
         assert view.widgets == []
 
-    def test_object_view_render_with_objects(self):
+    def test_object_view_render_with_objects(self, capsys):
         """测试ObjectView渲染（有对象）"""
         # 捕获print输出
-        captured_output = io.StringIO()
-        with patch('sys.stdout', captured_output):
-            self.test_view.render(self.test_object_set)
+        self.test_view.render(self.test_object_set)
 
-        output = captured_output.getvalue()
+        output = capsys.readouterr().out
 
-        # 验证输出包含预期内容
-        assert "--- Object View: 产品视图 ---" in output
-        assert "Object Type: Test Product" in output
-        assert "Total Objects: 2" in output
-        assert "Widgets:" in output
-        assert "- [Widget] 表格" in output
-        assert "- [Widget] 图表" in output
-        assert "- [Widget] 过滤器" in output
-        assert "-------------------------------" in output
+        # 验证输出包含预期内容（单次扫描）
+        missing = set(_EXPECTED_VIEW_OUTPUT) - set(
+            _EXPECTED_VIEW_PATTERN.findall(output)
+        )
+        assert not missing, missing
 
-    def test_object_view_render_empty_object_set(self):
+    def test_object_view_render_empty_object_set(self, capsys):
         """测试ObjectView渲染（空对象集）"""
         empty_object_set = ObjectSet(self.test_object_type, [])
 
-        captured_output = io.StringIO()
-        with patch('sys.stdout', captured_output):
-            self.test_view.render(empty_object_set)
+        self.test_view.render(empty_object_set)
 
-        output = captured_output.getvalue()
+        output = capsys.readouterr().out
 
         # 验证输出包含预期内容
         assert "Total Objects: 0" in output
 
-    def test_object_view_render_with_different_object_types(self):
+    def test_object_view_render_with_different_object_types(self, capsys):
         """测试ObjectView渲染（不同对象类型）"""
         # 创建不同类型的对象
         user_object_type = ObjectType(
@@ -132,11 +139,9 @@ class TestObjectViewExtended:
         )
         user_object_set = ObjectSet(user_object_type, [])
 
-        captured_output = io.StringIO()
-        with patch('sys.stdout', captured_output):
-            user_view.render(user_object_set)
+        user_view.render(user_object_set)
 
-        output = captured_output.getvalue()
+        output = capsys.readouterr().out
 
         # 验证输出显示正确的对象类型
         assert "--- Object View: 用户视图 ---" in output
@@ -242,15 +247,13 @@ class TestObjectExplorerExtended:
         assert self.explorer.views["test_employee"] == new_view
         assert len(self.explorer.views) == 1
 
-    def test_open_with_registered_view(self):
+    def test_open_with_registered_view(self, capsys):
         """测试打开已注册的视图"""
         self.explorer.register_view(self.employee_view)
 
-        captured_output = io.StringIO()
-        with patch('sys.stdout', captured_output):
-            self.explorer.open("test_employee", self.test_object_set)
+        self.explorer.open("test_employee", self.test_object_set)
 
-        output = captured_output.getvalue()
+        output = capsys.readouterr().out
 
         # 验证使用自定义视图渲染
         assert "--- Object View: 员工视图 ---" in output
@@ -259,48 +262,42 @@ class TestObjectExplorerExtended:
         assert "- [Widget] 列表" in output
         assert "- [Widget] 详情" in output
 
-    def test_open_with_unregistered_view(self):
+    def test_open_with_unregistered_view(self, capsys):
         """测试打开未注册的视图（显示默认列表）"""
-        captured_output = io.StringIO()
-        with patch('sys.stdout', captured_output):
-            self.explorer.open("test_employee", self.test_object_set)
+        self.explorer.open("test_employee", self.test_object_set)
 
-        output = captured_output.getvalue()
+        output = capsys.readouterr().out
 
         # 验证显示默认列表
         assert "No custom view for test_employee, using normalized Object View." in output
         assert "--- Object View: Test Employee (Normalized View) ---" in output
 
-    def test_open_with_empty_object_set_unregistered(self):
+    def test_open_with_empty_object_set_unregistered(self, capsys):
         """测试打开未注册视图的空对象集"""
         empty_object_set = ObjectSet(self.test_object_type, [])
 
-        captured_output = io.StringIO()
-        with patch('sys.stdout', captured_output):
-            self.explorer.open("test_employee", empty_object_set)
+        self.explorer.open("test_employee", empty_object_set)
 
-        output = captured_output.getvalue()
+        output = capsys.readouterr().out
 
         # 验证显示默认消息并渲染标准视图
         assert "No custom view for test_employee, using normalized Object View." in output
         assert "--- Object View: Test Employee (Normalized View) ---" in output
 
-    def test_open_with_empty_object_set_registered(self):
+    def test_open_with_empty_object_set_registered(self, capsys):
         """测试打开已注册视图的空对象集"""
         empty_object_set = ObjectSet(self.test_object_type, [])
         self.explorer.register_view(self.employee_view)
 
-        captured_output = io.StringIO()
-        with patch('sys.stdout', captured_output):
-            self.explorer.open("test_employee", empty_object_set)
+        self.explorer.open("test_employee", empty_object_set)
 
-        output = captured_output.getvalue()
+        output = capsys.readouterr().out
 
         # 验证使用自定义视图渲染
         assert "--- Object View: 员工视图 ---" in output
         assert "Total Objects: 0" in output
 
-    def test_open_different_object_types(self):
+    def test_open_different_object_types(self, capsys):
         """测试打开不同对象类型的视图"""
         self.explorer.register_view(self.employee_view)
         self.explorer.register_view(self.department_view)
@@ -308,19 +305,13 @@ class TestObjectExplorerExtended:
         employee_set = ObjectSet(self.test_object_type, self.test_objects)
         department_set = ObjectSet(self.another_object_type, [])
 
-        # 测试员工视图
-        emp_output = io.StringIO()
-        with patch('sys.stdout', emp_output):
-            self.explorer.open("test_employee", employee_set)
-
-        # 测试部门视图
-        dept_output = io.StringIO()
-        with patch('sys.stdout', dept_output):
-            self.explorer.open("test_department", department_set)
+        # 一次捕获两个视图的输出，用分隔符切分
+        self.explorer.open("test_employee", employee_set)
+        print("---SPLIT---")
+        self.explorer.open("test_department", department_set)
 
         # 验证不同视图显示正确内容
-        emp_result = emp_output.getvalue()
-        dept_result = dept_output.getvalue()
+        emp_result, dept_result = capsys.readouterr().out.split("---SPLIT---", 1)
 
         assert "--- Object View: 员工视图 ---" in emp_result
         assert "Test Employee" in emp_result
@@ -469,15 +460,13 @@ class TestQuiverExtended:
         ]
         self.test_object_set = ObjectSet(self.test_object_type, self.test_objects)
 
-    def test_quiver_analyze_single_object(self):
+    def test_quiver_analyze_single_object(self, capsys):
         """测试Quiver分析单个对象"""
         single_object_set = ObjectSet(self.test_object_type, [self.test_objects[0]])
 
-        captured_output = io.StringIO()
-        with patch('sys.stdout', captured_output):
-            self.quiver.analyze(single_object_set)
+        self.quiver.analyze(single_object_set)
 
-        output = captured_output.getvalue()
+        output = capsys.readouterr().out
 
         # 验证分析输出
         assert "--- Quiver Analysis ---" in output
@@ -485,35 +474,40 @@ class TestQuiverExtended:
         assert "Generating charts... [Done]" in output
         assert "-----------------------" in output
 
-    def test_quiver_analyze_multiple_objects(self):
+    def test_quiver_analyze_multiple_objects(self, capsys):
         """测试Quiver分析多个对象"""
-        captured_output = io.StringIO()
-        with patch('sys.stdout', captured_output):
-            self.quiver.analyze(self.test_object_set)
+        self.quiver.analyze(self.test_object_set)
 
-        output = captured_output.getvalue()
+        output = capsys.readouterr().out
 
         assert "--- Quiver Analysis ---" in output
         assert "Analyzing 2 objects of type test_analytics" in output
         assert "Generating charts... [Done]" in output
         assert "-----------------------" in output
 
-    def test_quiver_analyze_empty_object_set(self):
+    def test_quiver_analyze_returns_report(self, capsys):
+        """测试Quiver返回结构化分析报告，与打印内容一致"""
+        report = self.quiver.analyze(self.test_object_set)
+
+        assert report.header == "--- Quiver Analysis ---"
+        assert report.object_count == 2
+        assert report.type_name == "test_analytics"
+        assert f"Analyzing {report.object_count} objects of type {report.type_name}" in capsys.readouterr().out
+
+    def test_quiver_analyze_empty_object_set(self, capsys):
         """测试Quiver分析空对象集"""
         empty_object_set = ObjectSet(self.test_object_type, [])
 
-        captured_output = io.StringIO()
-        with patch('sys.stdout', captured_output):
-            self.quiver.analyze(empty_object_set)
+        self.quiver.analyze(empty_object_set)
 
-        output = captured_output.getvalue()
+        output = capsys.readouterr().out
 
         assert "--- Quiver Analysis ---" in output
         assert "Analyzing 0 objects of type test_analytics" in output
         assert "Generating charts... [Done]" in output
         assert "-----------------------" in output
 
-    def test_quiver_analyze_different_object_types(self):
+    def test_quiver_analyze_different_object_types(self, capsys):
         """测试Quiver分析不同对象类型"""
         user_object_type = ObjectType(
             api_name="test_user_analytics",
@@ -522,17 +516,15 @@ class TestQuiverExtended:
         )
         user_object_set = ObjectSet(user_object_type, [])
 
-        captured_output = io.StringIO()
-        with patch('sys.stdout', captured_output):
-            self.quiver.analyze(user_object_set)
+        self.quiver.analyze(user_object_set)
 
-        output = captured_output.getvalue()
+        output = capsys.readouterr().out
 
         assert "--- Quiver Analysis ---" in output
         assert "Analyzing 0 objects of type test_user_analytics" in output
         assert "Test User Analytics" not in output
 
-    def test_quiver_large_object_set_analysis(self):
+    def test_quiver_large_object_set_analysis(self, capsys):
         """测试Quiver分析大对象集"""
         large_object_list = []
         for i in range(100):
@@ -548,11 +540,9 @@ class TestQuiverExtended:
 
         large_object_set = ObjectSet(self.test_object_type, large_object_list)
 
-        captured_output = io.StringIO()
-        with patch('sys.stdout', captured_output):
-            self.quiver.analyze(large_object_set)
+        self.quiver.analyze(large_object_set)
 
-        output = captured_output.getvalue()
+        output = capsys.readouterr().out
 
         assert "--- Quiver Analysis ---" in output
         assert "Analyzing 100 objects of type test_analytics" in output
@@ -1,6 +1,9 @@
 # 本体框架核心模块更正测试
 # 基于实际API创建的准确测试用例
 
+import copy
+import sys
+from array import array
 import pytest
 import time
 from datetime import datetime, timezone
@@ -8,11 +11,64 @@ from typing import Any, Dict, List
 
 from src.ontology_framework.core import (
     PropertyType, PropertyDefinition, DerivedPropertyDefinition,
-    ObjectType, LinkType, ActionType, ActionParameter,
+    ObjectType, LinkType, ActionType, ActionParameter, ActionContext,
     ObjectInstance, ObjectSet, Ontology,
     PrimitiveType, ObjectTypeSpec, ObjectSetTypeSpec
 )
 from src.ontology_framework.permissions import AccessControlList, Principal, PermissionType
+from src.ontology_framework import core as core_module
+
+
+@pytest.fixture(scope="module")
+def user_type_template():
+    """模块级 user 类型模板，只构建一次"""
+    return ObjectType(
+        api_name="user",
+        display_name="用户",
+        properties={
+            "id": PropertyDefinition("id", PropertyType.STRING),
+            "name": PropertyDefinition("name", PropertyType.STRING),
+            "department": PropertyDefinition("department", PropertyType.STRING)
+        },
+        primary_key="id"
+    )
+
+
+@pytest.fixture
+def user_type(user_type_template):
+    """注册会改写类型字段，每个测试拿一份浅拷贝"""
+    return copy.copy(user_type_template)
+
+
+_OBJECT_TYPE_VARIANTS = [
+    ("user", "用户", "user_id"),
+    ("product", "产品", "product_id"),
+    ("order", "订单", "order_id"),
+]
+
+
+@pytest.fixture(
+    scope="module",
+    params=_OBJECT_TYPE_VARIANTS,
+    ids=[variant[0] for variant in _OBJECT_TYPE_VARIANTS],
+)
+def obj_type(request):
+    """每组参数只构建一次的ObjectType"""
+    api_name, display_name, primary_key = request.param
+    return ObjectType(
+        api_name=api_name,
+        display_name=display_name,
+        properties={
+            primary_key: PropertyDefinition(primary_key, PropertyType.STRING)
+        },
+        primary_key=primary_key
+    )
+
+
+@pytest.fixture(scope="module")
+def empty_ontology():
+    """只读查询用的空本体"""
+    return Ontology()
 
 
 class TestObjectTypeCorrected:
@@ -56,6 +112,55 @@ class TestObjectTypeCorrected:
         assert obj_type.properties["price"].type == PropertyType.INTEGER
         assert obj_type.properties["price"].description == "Price in cents"
 
+    def test_object_type_validate(self):
+        """测试validate按属性类型校验，并在add_property后重新编译"""
+        obj_type = ObjectType(
+            api_name="product",
+            display_name="产品",
+            primary_key="product_id"
+        )
+        obj_type.add_property("product_id", PropertyType.STRING)
+        obj_type.add_property("price", PropertyType.INTEGER)
+
+        assert obj_type.validate({"product_id": "p1", "price": 100})
+        assert obj_type.validate({"product_id": "p1"})
+        assert not obj_type.validate({"product_id": "p1", "price": "100"})
+        assert not obj_type.validate({"product_id": "p1", "price": True})
+
+        obj_type.add_property("active", PropertyType.BOOLEAN)
+        assert not obj_type.validate({"product_id": "p1", "active": 1})
+        assert obj_type.validate({"product_id": "p1", "active": False})
+
+    def test_object_type_frozen_after_register(self):
+        """测试注册后ObjectType属性只读，add_property抛出异常"""
+        obj_type = ObjectType(
+            api_name="frozen_product",
+            display_name="产品",
+            primary_key="product_id"
+        )
+        obj_type.add_property("product_id", PropertyType.STRING)
+        assert not obj_type.frozen
+
+        Ontology().register_object_type(obj_type)
+
+        assert obj_type.frozen
+        assert obj_type.properties == {"product_id": obj_type.properties["product_id"]}
+        with pytest.raises(ValueError, match="frozen"):
+            obj_type.add_property("price", PropertyType.INTEGER)
+        with pytest.raises(TypeError):
+            obj_type.properties["price"] = None
+        assert obj_type.validate({"product_id": "p1"})
+
+    def test_object_type_make_instance(self, user_type):
+        """测试make_instance按模式顺序填充属性，未给出的属性为None"""
+        user = user_type.make_instance("1", name="张三")
+
+        assert user.object_type_api_name == "user"
+        assert user.primary_key_value == "1"
+        assert list(user.property_values) == ["id", "name", "department"]
+        assert user.property_values == {"id": "1", "name": "张三", "department": None}
+        assert user_type.make_instance("2").property_values["id"] == "2"
+
     def test_object_type_add_derived_property(self):
         """测试添加派生属性"""
         obj_type = ObjectType(
@@ -193,6 +298,57 @@ class TestObjectInstanceCorrected:
         assert obj.get("status") == "active"
         assert obj.get("nonexistent") is None
 
+    def test_object_instance_values_are_frozen(self):
+        """测试property_values创建后只读，with_values返回新实例"""
+        source = {"id": "u1", "name": "王五"}
+        obj = ObjectInstance("user", "u1", source)
+        source["name"] = "改名"
+
+        assert obj.property_values["name"] == "王五"
+        with pytest.raises(TypeError):
+            obj.property_values["name"] = "赵六"
+
+        renamed = obj.with_values(name="赵六")
+        assert renamed.property_values == {"id": "u1", "name": "赵六"}
+        assert obj.property_values["name"] == "王五"
+        with pytest.raises(TypeError):
+            renamed.property_values["id"] = "u2"
+
+        clone = copy.deepcopy(obj)
+        assert clone == obj
+        with pytest.raises(TypeError):
+            clone.property_values["name"] = "赵六"
+
+    def test_runtime_metadata_allocated_on_first_annotation(self):
+        """测试runtime_metadata按需创建，读注解不会分配"""
+        obj = ObjectInstance("user", "u1", {"id": "u1"})
+        assert obj.get_annotation("score", 0) == 0
+        assert not obj.has_annotations
+        assert obj._runtime_metadata is None
+
+        obj.annotate("score", 0.9)
+        assert obj.has_annotations
+        assert obj.runtime_metadata == {"score": 0.9}
+        copied = obj.with_values(name="王五")
+        assert copied.get_annotation("score") == 0.9
+        assert copied.runtime_metadata is not obj.runtime_metadata
+        assert copy.deepcopy(obj).get_annotation("score") == 0.9
+
+        # 旧的 runtime_metadata 构造参数仍然可用
+        tagged = ObjectInstance("user", "u2", {"id": "u2"}, runtime_metadata={"source": "import"})
+        assert tagged.get_annotation("source") == "import"
+
+    def test_string_primary_keys_are_interned(self):
+        """测试字符串主键驻留，make_instance 中主键属性与主键共享同一对象"""
+        pk = "".join(["obj_", "42"])
+        obj = ObjectInstance("item", pk, {"id": pk})
+        assert obj.primary_key_value is sys.intern("obj_42")
+        assert ObjectInstance("item", 42).primary_key_value == 42
+
+        item_type = ObjectType("item", "Item", primary_key="id").add_property("id", PropertyType.STRING)
+        made = item_type.make_instance("".join(["obj_", "42"]))
+        assert made.property_values["id"] is made.primary_key_value is obj.primary_key_value
+
 
 class TestObjectSetCorrected:
     """ObjectSet类正确API测试"""
@@ -237,6 +393,72 @@ class TestObjectSetCorrected:
         assert len(engineers.all()) == 2
         assert all(obj.property_values.get("dept") == "工程" for obj in engineers.all())
 
+    def test_object_set_filter_index_refreshes_on_add(self):
+        """测试filter索引在add之后失效重建，且不可哈希的值退回线性扫描"""
+        user_type = ObjectType(
+            api_name="user",
+            display_name="用户",
+            primary_key="id"
+        )
+
+        obj_set = ObjectSet(user_type, [
+            ObjectInstance("user", "1", {"dept": "工程", "tags": ["a"]}),
+            ObjectInstance("user", "2", {"dept": "销售", "tags": ["b"]}),
+        ])
+
+        assert len(obj_set.filter("dept", "工程").all()) == 1
+        obj_set.add(ObjectInstance("user", "3", {"dept": "工程", "tags": ["a"]}))
+        assert len(obj_set.filter("dept", "工程").all()) == 2
+        assert len(obj_set.filter("dept", "财务").all()) == 0
+        assert len(obj_set.filter("tags", ["a"]).all()) == 2
+
+        # 同一取值的重复过滤复用同一快照；修改其中一个结果不影响另一个
+        first = obj_set.filter("dept", "工程")
+        second = obj_set.filter("dept", "工程")
+        assert first.all() is second.all()
+        first.add(ObjectInstance("user", "4", {"dept": "工程"}))
+        assert len(first.all()) == 3
+        assert len(second.all()) == 2
+        assert len(obj_set.filter("dept", "工程").all()) == 2
+
+    def test_object_set_caches_refresh_after_modify(self):
+        """测试提交的对象修改使已持有集合的filter索引与聚合列缓存失效"""
+        item_type = ObjectType(api_name="item", display_name="条目", primary_key="id")
+        item_type.add_property("id", PropertyType.STRING)
+        item_type.add_property("status", PropertyType.STRING)
+        item_type.add_property("qty", PropertyType.INTEGER)
+        ontology = Ontology()
+        ontology.register_object_type(item_type)
+        items = [item_type.make_instance(str(i), status="open", qty=1) for i in range(3)]
+        ontology.add_objects(items)
+
+        obj_set = ObjectSet(item_type, items, ontology)
+        assert len(obj_set.filter("status", "open").all()) == 3
+        assert obj_set.aggregate("qty", "sum") == 3
+
+        context = ActionContext(ontology, "tester")
+        context.modify_object(items[0], "status", "closed")
+        context.modify_object(items[0], "qty", 10)
+        context.apply_changes()
+
+        assert len(obj_set.filter("status", "open").all()) == 2
+        assert obj_set.filter("status", "closed").all() == (items[0],)
+        assert obj_set.aggregate("qty", "sum") == 12
+
+        # 版本号属于各自的本体：另一个本体的提交不会丢弃这里的索引
+        other = Ontology()
+        other.register_object_type(item_type)
+        other.add_objects([item_type.make_instance("x", status="open", qty=1)])
+        other_set = ObjectSet(item_type, other.get_objects_of_type("item"), other)
+        other_set.filter("status", "open")
+        index = other_set._indexes["status"]
+        context = ActionContext(ontology, "tester")
+        context.modify_object(items[1], "status", "closed")
+        context.apply_changes()
+        other_set.filter("status", "open")
+        assert other_set._indexes["status"] is index
+        assert len(obj_set.filter("status", "open").all()) == 1
+
     def test_object_set_aggregation(self):
         """测试ObjectSet聚合功能"""
         product_type = ObjectType(
@@ -260,23 +482,84 @@ class TestObjectSetCorrected:
         assert obj_set.aggregate("price", "min") == 100
         assert obj_set.aggregate("price", "count") == 3
 
+    def test_object_set_aggregation_large_column(self):
+        """测试大对象集聚合（NumPy 快速路径与纯 Python 路径结果一致）"""
+        product_type = ObjectType(
+            api_name="product",
+            display_name="产品",
+            primary_key="id"
+        )
+
+        objects = [
+            ObjectInstance("product", str(i), {"price": i, "sku": f"sku{i}"})
+            for i in range(1000)
+        ]
+        objects.append(ObjectInstance("product", "none", {"price": None}))
+        obj_set = ObjectSet(product_type, objects)
+
+        assert obj_set.aggregate("price", "sum") == sum(range(1000))
+        assert isinstance(obj_set.aggregate("price", "sum"), int)
+        assert obj_set.aggregate("price", "avg") == pytest.approx(499.5)
+        assert obj_set.aggregate("price", "max") == 999
+        assert obj_set.aggregate("price", "min") == 0
+        assert obj_set.aggregate("price", "count") == 1000
+        # 非数值列保持原有语义
+        assert obj_set.aggregate("sku", "max") == "sku999"
+        with pytest.raises(ValueError):
+            obj_set.aggregate("price", "median")
+
+        functions = ("sum", "avg", "max", "min", "count")
+        assert obj_set.aggregate_all("price") == {
+            fn: obj_set.aggregate("price", fn) for fn in functions
+        }
+        small_set = ObjectSet(product_type, objects[:10])
+        assert small_set.aggregate_all("price") == {
+            fn: small_set.aggregate("price", fn) for fn in functions
+        }
+        assert small_set.aggregate_all("missing") == dict.fromkeys(functions, 0.0)
+
+        obj_set.add(ObjectInstance("product", "1000", {"price": 1000}))
+        assert obj_set.aggregate("price", "max") == 1000
+
+    def test_object_set_large_integer_sum_does_not_wrap(self):
+        """测试大整数列求和超出 int64 时仍返回精确的 Python int"""
+        product_type = ObjectType("product", "产品", primary_key="id")
+        big = 2**62
+        obj_set = ObjectSet(product_type, [
+            ObjectInstance("product", str(i), {"price": big}) for i in range(300)
+        ])
+
+        assert obj_set.aggregate("price", "sum") == big * 300
+        assert obj_set.aggregate_all("price")["sum"] == big * 300
+        assert obj_set.aggregate("price", "max") == big
+
+    def test_object_set_integer_column_without_numpy(self, monkeypatch):
+        """测试未安装NumPy时，声明为INTEGER的大列缓存为array('q')且结果不变"""
+        monkeypatch.setattr(core_module, "np", None)
+        product_type = ObjectType("product", "产品", primary_key="id").add_properties(
+            {"id": PropertyType.STRING, "price": PropertyType.INTEGER, "sku": PropertyType.STRING}
+        )
+        obj_set = ObjectSet(product_type, [
+            ObjectInstance("product", str(i), {"price": i, "sku": f"sku{i:04d}"})
+            for i in range(1000)
+        ])
+
+        assert obj_set.aggregate_all("price") == {
+            "sum": sum(range(1000)), "avg": 499.5, "max": 999, "min": 0, "count": 1000
+        }
+        assert isinstance(obj_set._column_values("price"), array)
+        assert isinstance(obj_set._column_values("sku"), list)
+        assert obj_set.aggregate("sku", "max") == "sku0999"
+
 
 class TestOntologyCorrected:
     """Ontology类正确API测试"""
 
-    def test_ontology_type_registration(self):
+    def test_ontology_type_registration(self, user_type):
         """测试本体类型注册"""
         ontology = Ontology()
 
         # 注册对象类型
-        user_type = ObjectType(
-            api_name="user",
-            display_name="用户",
-            properties={
-                "id": PropertyDefinition("id", PropertyType.STRING)
-            },
-            primary_key="id"
-        )
         ontology.register_object_type(user_type)
 
         # 注册链接类型
@@ -309,20 +592,11 @@ class TestOntologyCorrected:
         assert retrieved_action is not None
         assert retrieved_action.display_name == "问候"
 
-    def test_ontology_object_management(self):
+    def test_ontology_object_management(self, user_type):
         """测试本体对象管理"""
         ontology = Ontology()
 
         # 注册对象类型
-        user_type = ObjectType(
-            api_name="user",
-            display_name="用户",
-            properties={
-                "id": PropertyDefinition("id", PropertyType.STRING),
-                "name": PropertyDefinition("name", PropertyType.STRING)
-            },
-            primary_key="id"
-        )
         ontology.register_object_type(user_type)
 
         # 添加对象
@@ -341,25 +615,130 @@ class TestOntologyCorrected:
         users = ontology.get_objects_of_type("user")
         assert len(users) == 2  # 直接使用len()，不需要.all()
 
+    def test_get_objects_of_type_list_maintained(self, user_type):
+        """测试get_objects_of_type返回不可变快照，写入后重建并保持插入顺序"""
+        ontology = Ontology()
+        ontology.register_object_type(user_type)
+        ontology.add_objects([
+            ObjectInstance("user", "1", {"id": "1"}),
+            ObjectInstance("user", "2", {"id": "2"}),
+        ])
+
+        users = ontology.get_objects_of_type("user")
+        assert isinstance(users, tuple)
+        assert ontology.get_objects_of_type("user") is users
+
+        ontology.add_object(ObjectInstance("user", "3", {"id": "3"}))
+        assert [u.primary_key_value for u in ontology.get_objects_of_type("user")] == ["1", "2", "3"]
+
+        ontology.delete_object("user", "1")
+        ontology.add_object(ObjectInstance("user", "2", {"id": "2", "name": "新"}))
+        users = ontology.get_objects_of_type("user")
+        assert [u.primary_key_value for u in users] == ["2", "3"]
+        assert users[0].property_values["name"] == "新"
+        assert ontology.get_objects_of_type("ghost") == ()
+
+    def test_ontology_deepcopy_is_independent(self, user_type):
+        """测试深拷贝本体后注册表查询与存储互不影响"""
+        ontology = Ontology()
+        ontology.register_object_type(user_type)
+        ontology.add_object(ObjectInstance("user", "1", {"id": "1"}))
+
+        clone = copy.deepcopy(ontology)
+        clone.add_object(ObjectInstance("user", "2", {"id": "2"}))
+
+        cloned_type = clone.get_object_type("user")
+        assert cloned_type is not user_type
+        assert cloned_type == user_type
+        assert cloned_type.frozen
+        assert len(ontology.get_objects_of_type("user")) == 1
+        assert len(clone.get_objects_of_type("user")) == 2
+
+    def test_object_type_add_properties(self):
+        """测试批量添加属性：支持映射与二元组序列，注册后冻结"""
+        obj_type = ObjectType("item", "Item", primary_key="id").add_properties(
+            {"id": PropertyType.STRING, "qty": PropertyType.INTEGER}
+        )
+        obj_type.add_properties([("note", PropertyType.STRING)])
+
+        assert list(obj_type.properties) == ["id", "qty", "note"]
+        assert obj_type.properties["qty"].type == PropertyType.INTEGER
+
+        Ontology().register_object_type(obj_type)
+        with pytest.raises(ValueError, match="frozen"):
+            obj_type.add_properties({"late": PropertyType.STRING})
+
+    def test_registry_lookups_are_bound_dict_get(self, user_type):
+        """测试注册表查询直接绑定到各自 dict.get（深拷贝后重新绑定）"""
+        ontology = Ontology()
+        ontology.register_object_type(user_type)
+        clone = copy.deepcopy(ontology)
+
+        for onto in (ontology, clone):
+            assert onto.get_object_type.__self__ is onto.object_types
+            assert onto.get_link_type.__self__ is onto.link_types
+            assert onto.get_action_type.__self__ is onto.action_types
+            assert onto.get_function.__self__ is onto.functions
+        assert ontology.get_object_type("user") is user_type
+
+    def test_add_objects(self, user_type):
+        """测试批量添加对象：逐个可取回，且与逐个添加结果一致"""
+        ontology = Ontology()
+        ontology.register_object_type(user_type)
+
+        users = [
+            ObjectInstance("user", str(i), {"id": str(i), "name": f"用户{i}"})
+            for i in range(3)
+        ]
+        ontology.add_objects(users)
+
+        assert ontology.get_object("user", "1") is users[1]
+        assert ontology.get_object("user", "1")._ontology is ontology
+        assert [u.primary_key_value for u in ontology.get_objects_of_type("user")] == ["0", "1", "2"]
+
+        # 已存在的主键被批量覆盖
+        ontology.add_objects([ObjectInstance("user", "1", {"id": "1", "name": "新"})])
+        assert ontology.get_object("user", "1").get("name") == "新"
+        assert len(ontology.get_objects_of_type("user")) == 3
+
+    def test_add_objects_checks_all_types_first(self, user_type):
+        """测试批量添加遇到未知类型时整体拒绝"""
+        ontology = Ontology()
+        ontology.register_object_type(user_type)
+
+        with pytest.raises(ValueError, match="Unknown object type: ghost"):
+            ontology.add_objects([
+                ObjectInstance("user", "1", {"id": "1"}),
+                ObjectInstance("ghost", "g1", {}),
+            ])
+
+        assert ontology.get_objects_of_type("user") == ()
+
+    def test_scan_objects_filters_use_value_index(self, user_type):
+        """测试带过滤的scan走按值索引：多条件、limit、不可哈希值与写入后失效"""
+        ontology = Ontology()
+        ontology.register_object_type(user_type)
+        ontology.add_objects([
+            ObjectInstance("user", str(i), {"id": str(i), "name": "a" if i % 2 else "b", "age": i})
+            for i in range(6)
+        ])
+
+        assert [o.primary_key_value for o in ontology.scan_objects("user", {"name": "a"})] == ["1", "3", "5"]
+        assert [o.primary_key_value for o in ontology.scan_objects("user", {"name": "a", "age": 3})] == ["3"]
+        assert len(ontology.scan_objects("user", {"name": "b"}, limit=2)) == 2
+        assert ontology.scan_objects("user", {"name": ["a"]}) == []
+
+        ontology.add_object(ObjectInstance("user", "6", {"id": "6", "name": "a", "age": 6}))
+        ontology.delete_object("user", "1")
+        assert [o.primary_key_value for o in ontology.scan_objects("user", {"name": "a"})] == ["3", "5", "6"]
+
 
 class TestParameterizedCorrected:
     """参数化测试"""
 
-    @pytest.mark.parametrize("api_name,display_name,primary_key", [
-        ("user", "用户", "user_id"),
-        ("product", "产品", "product_id"),
-        ("order", "订单", "order_id")
-    ])
-    def test_object_type_variations(self, api_name, display_name, primary_key):
+    def test_object_type_variations(self, obj_type, request):
         """测试不同类型的ObjectType创建"""
-        obj_type = ObjectType(
-            api_name=api_name,
-            display_name=display_name,
-            properties={
-                primary_key: PropertyDefinition(primary_key, PropertyType.STRING)
-            },
-            primary_key=primary_key
-        )
+        api_name, display_name, primary_key = request.node.callspec.params["obj_type"]
 
         assert obj_type.api_name == api_name
         assert obj_type.display_name == display_name
@@ -379,29 +758,59 @@ class TestParameterizedCorrected:
         assert prop_def.type == property_type
         assert prop_def.description == "Test property"
 
+    def test_definitions_are_interned(self):
+        """测试相同的属性/参数定义复用同一实例"""
+        first = PropertyDefinition("id", PropertyType.STRING)
+        assert PropertyDefinition(name="id", type=PropertyType.STRING) is first
+        assert PropertyDefinition("id", PropertyType.INTEGER) is not first
+
+        param = ActionParameter("username", PropertyType.STRING)
+        assert ActionParameter("username", PropertyType.STRING, True) is param
+        assert ActionParameter("username", PropertyType.STRING, False) is not param
+
+    def test_interned_definitions_not_rewritten_by_equal_args(self):
+        """测试相等但不相同的参数不会改写已共享的定义"""
+        param = ActionParameter("qty", PropertyType.INTEGER, True)
+        assert ActionParameter("qty", PropertyType.INTEGER, 1) is param
+        assert param.required is True
+
+        prop_def = PropertyDefinition("x", PropertyType.INTEGER)
+        assert PropertyDefinition("x", "integer") is prop_def
+        assert prop_def.type is PropertyType.INTEGER
+
+        # 非 PropertyType 取值原样保留，校验器编译时跳过
+        custom = PropertyDefinition("y", "geo_point")
+        assert custom.type == "geo_point"
+        geo_type = ObjectType("place", "地点", properties={"y": custom}, primary_key="y")
+        assert geo_type.validate({"y": (1.0, 2.0)})
+        assert PropertyDefinition("z", True).type is True
+
+        copied = copy.deepcopy(prop_def)
+        assert copied == prop_def
+
 
 class TestErrorHandlingCorrected:
     """错误处理测试"""
 
-    def test_object_type_not_found(self):
+    def test_object_type_not_found(self, empty_ontology):
         """测试对象类型不存在的错误"""
-        ontology = Ontology()
+        ontology = empty_ontology
 
         # get_object_type返回None而不是抛出KeyError
         result = ontology.get_object_type("nonexistent_type")
         assert result is None
 
-    def test_link_type_not_found(self):
+    def test_link_type_not_found(self, empty_ontology):
         """测试链接类型不存在的错误"""
-        ontology = Ontology()
+        ontology = empty_ontology
 
         # get_link_type返回None而不是抛出KeyError
         result = ontology.get_link_type("nonexistent_link")
         assert result is None
 
-    def test_action_type_not_found(self):
+    def test_action_type_not_found(self, empty_ontology):
         """测试操作类型不存在的错误"""
-        ontology = Ontology()
+        ontology = empty_ontology
 
         # get_action_type返回None而不是抛出KeyError
         result = ontology.get_action_type("nonexistent_action")
@@ -422,21 +831,11 @@ class TestErrorHandlingCorrected:
 class TestSimpleIntegrationCorrected:
     """简单集成测试"""
 
-    def test_complete_workflow_simple(self):
+    def test_complete_workflow_simple(self, user_type):
         """测试完整工作流程（简化版）"""
         ontology = Ontology()
 
-        # 1. 定义和注册对象类型
-        user_type = ObjectType(
-            api_name="user",
-            display_name="用户",
-            properties={
-                "id": PropertyDefinition("id", PropertyType.STRING),
-                "name": PropertyDefinition("name", PropertyType.STRING),
-                "department": PropertyDefinition("department", PropertyType.STRING)
-            },
-            primary_key="id"
-        )
+        # 1. 注册对象类型
         ontology.register_object_type(user_type)
 
         # 2. 创建用户对象
@@ -3,13 +3,10 @@
 
 import pytest
 import time
-import uuid
-from unittest.mock import Mock, patch
-import io
+from typing import NamedTuple
 
 from ontology_framework.core import (
     ObjectType,
-    ObjectInstance,
     ObjectSet,
     ActionType,
     Ontology,
@@ -19,85 +16,96 @@ from ontology_framework.services import ObjectSetService, ActionService
 from ontology_framework.applications import ObjectView, ObjectExplorer, Quiver
 from ontology_framework.permissions import AccessControlList, Principal, PermissionType
 from ontology_framework.logging_config import LoggingContext, get_logger
-from ontology_framework.exceptions import OntologyError, ErrorSeverity
+from ontology_framework.exceptions import ErrorSeverity, OntologyError, ValidationError
+
+_ECOM_LOGGER = get_logger("ecommerce_system")
+_PM_LOGGER = get_logger("project_management")
+_ERR_LOGGER = get_logger("error_handling_test")
+_QUIVER = Quiver()  # 无状态，全模块共享
+
+
+class FrozenClock:
+    """把 time.time 固定为 t 的轻量上下文，不分配 MagicMock；修改 t 即可推进时间"""
+
+    def __init__(self, t):
+        self.t = t
+
+    def __enter__(self):
+        self._original = time.time
+        time.time = lambda: self.t
+        return self
+
+    def __exit__(self, *exc_info):
+        time.time = self._original
+
+
+def _make_type(api_name, display_name, props):
+    """按属性名元组构建全部为字符串属性、主键为 id 的对象类型"""
+    obj_type = ObjectType(api_name=api_name, display_name=display_name, primary_key="id")
+    add = obj_type.add_property
+    string = PropertyType.STRING
+    for prop in props:
+        add(prop, string)
+    return obj_type
 
 
 class TestEcommerceBusinessFlow:
     """电商业务流程端到端测试"""
 
-    def setup_method(self):
-        """初始化电商系统"""
-        self.ontology = Ontology()
-        self.product_service = ObjectSetService()
-        self.order_service = ObjectSetService()
-        self.action_service = ActionService(self.ontology)
-        self.explorer = ObjectExplorer()
-        self.quiver = Quiver()
-        self.logger = get_logger("ecommerce_system")
+    @pytest.fixture(scope="class", autouse=True)
+    def world(self, request):
+        """初始化电商系统：本体、类型、权限和动作每个测试类只构建一次"""
+        cls = request.cls
+        cls.ontology = Ontology()
+        cls.logger = _ECOM_LOGGER
 
         # 设置管理员用户
-        self.admin = Principal("admin", "admin")
-        self.customer = Principal("customer", "customer")
+        cls.admin = Principal("admin", "admin")
+        cls.customer = Principal("customer", "customer")
 
         # 创建产品对象类型
-        self.product_type = ObjectType(
-            api_name="product",
-            display_name="Product",
-            primary_key="id"
+        cls.product_type = _make_type(
+            "product", "Product",
+            ("id", "name", "price", "category", "stock"),
         )
-        self.product_type.add_property("id", PropertyType.STRING)
-        self.product_type.add_property("name", PropertyType.STRING)
-        self.product_type.add_property("price", PropertyType.STRING)
-        self.product_type.add_property("category", PropertyType.STRING)
-        self.product_type.add_property("stock", PropertyType.STRING)
 
         # 创建订单对象类型
-        self.order_type = ObjectType(
-            api_name="order",
-            display_name="Order",
-            primary_key="id"
+        cls.order_type = _make_type(
+            "order", "Order",
+            ("id", "customer_id", "total_amount", "status", "items"),
         )
-        self.order_type.add_property("id", PropertyType.STRING)
-        self.order_type.add_property("customer_id", PropertyType.STRING)
-        self.order_type.add_property("total_amount", PropertyType.STRING)
-        self.order_type.add_property("status", PropertyType.STRING)
-        self.order_type.add_property("items", PropertyType.STRING)
 
         # 创建订单项对象类型
-        self.order_item_type = ObjectType(
-            api_name="order_item",
-            display_name="Order Item",
-            primary_key="id"
+        cls.order_item_type = _make_type(
+            "order_item", "Order Item",
+            ("id", "order_id", "product_id", "quantity", "price"),
         )
-        self.order_item_type.add_property("id", PropertyType.STRING)
-        self.order_item_type.add_property("order_id", PropertyType.STRING)
-        self.order_item_type.add_property("product_id", PropertyType.STRING)
-        self.order_item_type.add_property("quantity", PropertyType.STRING)
-        self.order_item_type.add_property("price", PropertyType.STRING)
 
         # 注册所有对象类型
-        self.ontology.register_object_type(self.product_type)
-        self.ontology.register_object_type(self.order_type)
-        self.ontology.register_object_type(self.order_item_type)
+        cls.ontology.register_object_type(cls.product_type)
+        cls.ontology.register_object_type(cls.order_type)
+        cls.ontology.register_object_type(cls.order_item_type)
 
         # 设置权限
         product_acl = AccessControlList()
         product_acl.grant("admin", PermissionType.EDIT)
         product_acl.grant("customer", PermissionType.VIEW)
-        self.product_type.permissions = product_acl
+        cls.product_type.permissions = product_acl
 
         order_acl = AccessControlList()
         order_acl.grant("admin", PermissionType.EDIT)
         order_acl.grant("customer", PermissionType.VIEW)
-        self.order_type.permissions = order_acl
+        cls.order_type.permissions = order_acl
 
         # 创建业务动作
-        self._setup_business_actions()
+        cls._setup_business_actions()
 
-        # 创建业务视图
-        self._setup_business_views()
+    def setup_method(self):
+        """每个测试使用独立的动作服务（持有动作日志）"""
+        self.action_service = ActionService(self.ontology)
 
-    def _setup_business_actions(self):
+    @classmethod
+    def _setup_business_actions(cls):
         """设置业务动作"""
         # 添加产品动作
         add_product_action = ActionType(
@@ -115,7 +123,7 @@ class TestEcommerceBusinessFlow:
             context.create_object("product", product_id, kwargs)
 
         add_product_action.logic = add_product_logic
-        self.ontology.register_action_type(add_product_action)
+        cls.ontology.register_action_type(add_product_action)
 
         # 创建订单动作
         create_order_action = ActionType(
@@ -137,239 +145,246 @@ class TestEcommerceBusinessFlow:
             })
 
         create_order_action.logic = create_order_logic
-        self.ontology.register_action_type(create_order_action)
-
-    def _setup_business_views(self):
-        """设置业务视图"""
-        # 产品管理视图
-        self.product_view = ObjectView(
-            object_type=self.product_type,
-            title="产品管理视图",
-            widgets=["产品列表", "价格分析", "库存监控"]
-        )
-        self.explorer.register_view(self.product_view)
-
-        # 订单管理视图
-        self.order_view = ObjectView(
-            object_type=self.order_type,
-            title="订单管理视图",
-            widgets=["订单列表", "销售统计", "客户分析"]
-        )
-        self.explorer.register_view(self.order_view)
-
-    def test_complete_ecommerce_flow(self):
-        """测试完整的电商业务流程"""
-        # Step 1: 管理员添加产品
-        with LoggingContext(user_id="admin", operation="product_management"):
-            with patch('time.time', return_value=1640995200):  # 2022-01-01
-                with patch('uuid.uuid4', return_value='product-uuid-001'):
-                    add_log = self.action_service.execute_action(
-                        "add_product",
-                        {
-                            "name": "Laptop Pro",
-                            "price": "999.99",
-                            "category": "Electronics",
-                            "stock": "50"
-                        },
-                        self.admin
-                    )
+        cls.ontology.register_action_type(create_order_action)
+
+    def test_admin_add_product(self):
+        """管理员添加产品"""
+        with (
+            LoggingContext(user_id="admin", operation="product_management"),
+            FrozenClock(1640995200),  # 2022-01-01
+        ):
+            add_log = self.action_service.execute_action(
+                "add_product",
+                {
+                    "name": "Laptop Pro",
+                    "price": "999.99",
+                    "category": "Electronics",
+                    "stock": "50"
+                },
+                self.admin
+            )
 
         # 验证产品添加成功
         assert add_log.action_type_api_name == "add_product"
         assert add_log.parameters["name"] == "Laptop Pro"
         assert add_log.changes is not None
 
-        # Step 2: 创建实际产品对象用于演示
-        laptop = ObjectInstance(
-            object_type_api_name="product",
-            primary_key_value="prod_001",
-            property_values={
-                "id": "prod_001",
-                "name": "Laptop Pro",
-                "price": "999.99",
-                "category": "Electronics",
-                "stock": "50"
-            }
-        )
-        self.product_service.index_object(laptop)
-
-        # 添加更多产品
-        products = [
-            ObjectInstance(
-                object_type_api_name="product",
-                primary_key_value="prod_002",
-                property_values={
-                    "id": "prod_002",
-                    "name": "Wireless Mouse",
-                    "price": "29.99",
-                    "category": "Electronics",
-                    "stock": "100"
-                }
-            ),
-            ObjectInstance(
-                object_type_api_name="product",
-                primary_key_value="prod_003",
-                property_values={
-                    "id": "prod_003",
-                    "name": "USB-C Hub",
-                    "price": "49.99",
-                    "category": "Electronics",
-                    "stock": "75"
-                }
+    def test_customer_create_order(self):
+        """客户创建订单"""
+        with (
+            LoggingContext(user_id="customer", operation="order_creation"),
+            FrozenClock(1640995300),
+        ):
+            order_log = self.action_service.execute_action(
+                "create_order",
+                {
+                    "customer_id": "cust_001",
+                    "items": '[{"product_id": "prod_001", "quantity": 1}]'
+                },
+                self.customer
             )
-        ]
 
-        for product in products:
-            self.product_service.index_object(product)
+        # 验证订单创建成功
+        assert order_log.action_type_api_name == "create_order"
+        assert order_log.parameters["customer_id"] == "cust_001"
 
-        # Step 3: 管理员查看产品目录
-        product_set = self.product_service.get_base_object_set(
-            self.product_type,
-            principal_id="admin"
+
+class Shop(NamedTuple):
+    """已索引好产品与订单的只读电商数据"""
+
+    product_type: ObjectType
+    order_type: ObjectType
+    product_service: ObjectSetService
+    order_service: ObjectSetService
+    explorer: ObjectExplorer
+    quiver: Quiver
+
+
+@pytest.fixture(scope="module")
+def populated_shop():
+    """产品和订单只索引一次，供下面的只读断言共享"""
+    product_type = _make_type(
+        "product", "Product",
+        ("id", "name", "price", "category", "stock"),
+    )
+    order_type = _make_type(
+        "order", "Order",
+        ("id", "customer_id", "total_amount", "status", "items"),
+    )
+
+    # 只读断言以 admin 身份取对象集，读取需要 VIEW（EDIT 不隐含 VIEW）
+    product_acl = AccessControlList()
+    product_acl.grant("admin", PermissionType.VIEW)
+    product_acl.grant("admin", PermissionType.EDIT)
+    product_acl.grant("customer", PermissionType.VIEW)
+    product_type.permissions = product_acl
+
+    order_acl = AccessControlList()
+    order_acl.grant("admin", PermissionType.VIEW)
+    order_acl.grant("admin", PermissionType.EDIT)
+    order_acl.grant("customer", PermissionType.VIEW)
+    order_type.permissions = order_acl
+
+    # 业务视图
+    explorer = ObjectExplorer()
+    explorer.register_view(ObjectView(
+        object_type=product_type,
+        title="产品管理视图",
+        widgets=["产品列表", "价格分析", "库存监控"]
+    ))
+    explorer.register_view(ObjectView(
+        object_type=order_type,
+        title="订单管理视图",
+        widgets=["订单列表", "销售统计", "客户分析"]
+    ))
+
+    product_service = ObjectSetService()
+    product_service.index_objects([
+        product_type.make_instance(
+            pk, name=name, price=price, category="Electronics", stock=stock
+        )
+        for pk, name, price, stock in (
+            ("prod_001", "Laptop Pro", "999.99", "50"),
+            ("prod_002", "Wireless Mouse", "29.99", "100"),
+            ("prod_003", "USB-C Hub", "49.99", "75"),
         )
+    ])
 
-        captured_output = io.StringIO()
-        with patch('sys.stdout', captured_output):
-            self.explorer.open("product", product_set)
+    order_service = ObjectSetService()
+    order_service.index_object(order_type.make_instance(
+        "order_001",
+        customer_id="cust_001",
+        total_amount="999.99",
+        status="pending",
+        items='[{"product_id": "prod_001", "quantity": 1}]'
+    ))
 
-        view_output = captured_output.getvalue()
-        assert "--- Object View: 产品管理视图 ---" in view_output
-        assert "Total Objects: 3" in view_output
+    return Shop(product_type, order_type, product_service, order_service, explorer, _QUIVER)
 
-        # Step 4: 客户搜索产品
-        search_results = self.product_service.search(self.product_type, "Laptop")
-        assert len(search_results.all()) == 1
-        assert search_results.all()[0].property_values["name"] == "Laptop Pro"
-
-        electronics_results = self.product_service.search(self.product_type, "Electronics")
-        assert len(electronics_results.all()) == 3  # 所有产品都是电子产品
-
-        # Step 5: 客户创建订单
-        with LoggingContext(user_id="customer", operation="order_creation"):
-            with patch('time.time', return_value=1640995300):
-                with patch('uuid.uuid4', return_value='order-uuid-001'):
-                    order_log = self.action_service.execute_action(
-                        "create_order",
-                        {
-                            "customer_id": "cust_001",
-                            "items": '[{"product_id": "prod_001", "quantity": 1}]'
-                        },
-                        self.customer
-                    )
 
-        # 验证订单创建成功
-        assert order_log.action_type_api_name == "create_order"
-        assert order_log.parameters["customer_id"] == "cust_001"
+class TestPopulatedShop:
+    """基于已索引电商数据的只读断言"""
 
-        # Step 6: 创建实际订单对象
-        order = ObjectInstance(
-            object_type_api_name="order",
-            primary_key_value="order_001",
-            property_values={
-                "id": "order_001",
-                "customer_id": "cust_001",
-                "total_amount": "999.99",
-                "status": "pending",
-                "items": '[{"product_id": "prod_001", "quantity": 1}]'
-            }
+    def test_admin_view_catalog(self, populated_shop, capsys):
+        """管理员查看产品目录"""
+        product_set = populated_shop.product_service.get_base_object_set(
+            populated_shop.product_type,
+            principal_id="admin"
         )
-        self.order_service.index_object(order)
+        populated_shop.explorer.open("product", product_set)
+        view_output = capsys.readouterr().out
+        assert "--- Object View: 产品管理视图 ---" in view_output
+        assert "Total Objects: 3" in view_output
 
-        # Step 7: 管理员查看订单
-        order_set = self.order_service.get_base_object_set(
-            self.order_type,
+    def test_customer_search(self, populated_shop):
+        """客户搜索产品"""
+        hits = populated_shop.product_service.search(populated_shop.product_type, "Laptop").all()
+        assert len(hits) == 1
+        assert hits[0].property_values["name"] == "Laptop Pro"
+
+    def test_electronics_search(self, populated_shop):
+        """所有产品都是电子产品"""
+        hits = populated_shop.product_service.search(
+            populated_shop.product_type, "Electronics"
+        ).all()
+        assert len(hits) == 3
+
+    def test_order_view(self, populated_shop, capsys):
+        """管理员查看订单"""
+        order_set = populated_shop.order_service.get_base_object_set(
+            populated_shop.order_type,
             principal_id="admin"
         )
-
-        captured_output = io.StringIO()
-        with patch('sys.stdout', captured_output):
-            self.explorer.open("order", order_set)
-
-        order_view_output = captured_output.getvalue()
+        populated_shop.explorer.open("order", order_set)
+        order_view_output = capsys.readouterr().out
         assert "--- Object View: 订单管理视图 ---" in order_view_output
         assert "Total Objects: 1" in order_view_output
 
-        # Step 8: 生成业务分析报告
-        product_analysis = io.StringIO()
-        with patch('sys.stdout', product_analysis):
-            self.quiver.analyze(product_set)
-
-        analysis_output = product_analysis.getvalue()
-        assert "--- Quiver Analysis ---" in analysis_output
-        assert "Analyzing 1 objects of type order" in analysis_output
-
-        # Step 9: 验证完整业务流程
+    def test_generate_report(self, populated_shop):
+        """生成业务分析报告"""
+        product_set = populated_shop.product_service.get_base_object_set(
+            populated_shop.product_type,
+            principal_id="admin"
+        )
+        report = populated_shop.quiver.analyze(product_set)
+        assert report.header == "--- Quiver Analysis ---"
+        assert (report.object_count, report.type_name) == (3, "product")
+
+    def test_shop_counts(self, populated_shop):
+        """验证业务数据一致性"""
+        product_set = populated_shop.product_service.get_base_object_set(
+            populated_shop.product_type,
+            principal_id="admin"
+        )
+        order_set = populated_shop.order_service.get_base_object_set(
+            populated_shop.order_type,
+            principal_id="admin"
+        )
         assert len(product_set.all()) == 3
         assert len(order_set.all()) == 1
 
-        # 验证业务数据一致性
-        total_products = len(self.product_service.search(self.product_type, "").all())
-        total_orders = len(self.order_service.search(self.order_type, "").all())
-        assert total_products == 3
-        assert total_orders == 1
+        product_service = populated_shop.product_service
+        order_service = populated_shop.order_service
+        assert len(product_service.search(populated_shop.product_type, "").all()) == 3
+        assert len(order_service.search(populated_shop.order_type, "").all()) == 1
 
 
 class TestProjectManagementWorkflow:
     """项目管理业务流程测试"""
 
-    def setup_method(self):
-        """初始化项目管理系统"""
-        self.ontology = Ontology()
-        self.project_service = ObjectSetService()
-        self.task_service = ObjectSetService()
-        self.action_service = ActionService(self.ontology)
-        self.logger = get_logger("project_management")
+    @pytest.fixture(scope="class", autouse=True)
+    def world(self, request):
+        """初始化项目管理系统，每个测试类只构建一次"""
+        cls = request.cls
+        cls.ontology = Ontology()
+        cls.logger = _PM_LOGGER
 
         # 项目经理和团队成员
-        self.project_manager = Principal("pm", "project_manager")
-        self.team_member = Principal("dev", "developer")
+        cls.project_manager = Principal("pm", "project_manager")
+        cls.team_member = Principal("dev", "developer")
 
         # 创建项目对象类型
-        self.project_type = ObjectType(
-            api_name="project",
-            display_name="Project",
-            primary_key="id"
+        cls.project_type = _make_type(
+            "project", "Project",
+            ("id", "name", "description", "status", "start_date", "end_date"),
         )
-        self.project_type.add_property("id", PropertyType.STRING)
-        self.project_type.add_property("name", PropertyType.STRING)
-        self.project_type.add_property("description", PropertyType.STRING)
-        self.project_type.add_property("status", PropertyType.STRING)
-        self.project_type.add_property("start_date", PropertyType.STRING)
-        self.project_type.add_property("end_date", PropertyType.STRING)
 
         # 创建任务对象类型
-        self.task_type = ObjectType(
-            api_name="task",
-            display_name="Task",
-            primary_key="id"
+        cls.task_type = _make_type(
+            "task", "Task",
+            ("id", "project_id", "title", "description", "status", "assignee", "priority"),
         )
-        self.task_type.add_property("id", PropertyType.STRING)
-        self.task_type.add_property("project_id", PropertyType.STRING)
-        self.task_type.add_property("title", PropertyType.STRING)
-        self.task_type.add_property("description", PropertyType.STRING)
-        self.task_type.add_property("status", PropertyType.STRING)
-        self.task_type.add_property("assignee", PropertyType.STRING)
-        self.task_type.add_property("priority", PropertyType.STRING)
 
         # 注册对象类型
-        self.ontology.register_object_type(self.project_type)
-        self.ontology.register_object_type(self.task_type)
+        cls.ontology.register_object_type(cls.project_type)
+        cls.ontology.register_object_type(cls.task_type)
 
         # 设置权限
+        # 工作流中 pm 需要以 VIEW 读取对象集（EDIT 不隐含 VIEW）
         project_acl = AccessControlList()
+        project_acl.grant("pm", PermissionType.VIEW)
         project_acl.grant("pm", PermissionType.EDIT)
         project_acl.grant("dev", PermissionType.VIEW)
-        self.project_type.permissions = project_acl
+        cls.project_type.permissions = project_acl
 
         task_acl = AccessControlList()
+        task_acl.grant("pm", PermissionType.VIEW)
         task_acl.grant("pm", PermissionType.EDIT)
+        task_acl.grant("dev", PermissionType.VIEW)
         task_acl.grant("dev", PermissionType.EDIT)  # 开发者可以编辑任务
-        self.task_type.permissions = task_acl
+        cls.task_type.permissions = task_acl
 
         # 创建项目管理动作
-        self._setup_project_actions()
+        cls._setup_project_actions()
 
-    def _setup_project_actions(self):
+    def setup_method(self):
+        """每个测试使用独立的服务实例"""
+        self.project_service = ObjectSetService()
+        self.task_service = ObjectSetService()
+        self.action_service = ActionService(self.ontology)
+
+    @classmethod
+    def _setup_project_actions(cls):
         """设置项目管理动作"""
         # 创建项目动作
         create_project_action = ActionType(
@@ -389,7 +404,7 @@ class TestProjectManagementWorkflow:
             })
 
         create_project_action.logic = create_project_logic
-        self.ontology.register_action_type(create_project_action)
+        cls.ontology.register_action_type(create_project_action)
 
         # 创建任务动作
         create_task_action = ActionType(
@@ -411,38 +426,34 @@ class TestProjectManagementWorkflow:
             })
 
         create_task_action.logic = create_task_logic
-        self.ontology.register_action_type(create_task_action)
+        cls.ontology.register_action_type(create_task_action)
 
     def test_project_lifecycle_workflow(self):
         """测试完整的项目生命周期工作流"""
         # Step 1: 项目经理创建项目
-        with LoggingContext(user_id="pm", operation="project_creation"):
-            with patch('time.time', return_value=1672531200):  # 2023-01-01
-                with patch('uuid.uuid4', return_value='project-uuid-001'):
-                    project_log = self.action_service.execute_action(
-                        "create_project",
-                        {
-                            "name": "E-commerce Platform",
-                            "description": "New e-commerce platform development"
-                        },
-                        self.project_manager
-                    )
+        with (
+            LoggingContext(user_id="pm", operation="project_creation"),
+            FrozenClock(1672531200),  # 2023-01-01
+        ):
+            project_log = self.action_service.execute_action(
+                "create_project",
+                {
+                    "name": "E-commerce Platform",
+                    "description": "New e-commerce platform development"
+                },
+                self.project_manager
+            )
 
         assert project_log.action_type_api_name == "create_project"
         assert project_log.parameters["name"] == "E-commerce Platform"
 
         # 创建实际项目对象
-        project = ObjectInstance(
-            object_type_api_name="project",
-            primary_key_value="proj_001",
-            property_values={
-                "id": "proj_001",
-                "name": "E-commerce Platform",
-                "description": "New e-commerce platform development",
-                "status": "active",
-                "start_date": "2024-01-01",
-                "end_date": None
-            }
+        project = self.project_type.make_instance(
+            "proj_001",
+            name="E-commerce Platform",
+            description="New e-commerce platform development",
+            status="active",
+            start_date="2024-01-01"
         )
         self.project_service.index_object(project)
 
@@ -465,37 +476,40 @@ class TestProjectManagementWorkflow:
             }
         ]
 
-        for i, task_data in enumerate(tasks_data, 1):
-            with LoggingContext(user_id="pm", operation="task_creation"):
-                with patch('time.time', return_value=1672531200 + i):
-                    with patch('uuid.uuid4', return_value=f'task-uuid-{i:03d}'):
-                        task_log = self.action_service.execute_action(
-                            "create_task",
-                            {
-                                "project_id": "proj_001",
-                                **task_data
-                            },
-                            self.project_manager
-                        )
+        # 整个循环只进入一次上下文，每轮只推进时钟
+        execute = self.action_service.execute_action
+        project_manager = self.project_manager
+        with (
+            LoggingContext(user_id="pm", operation="task_creation"),
+            FrozenClock(1672531200) as clock,
+        ):
+            for i, task_data in enumerate(tasks_data, 1):
+                clock.t = 1672531200 + i
+                task_log = execute(
+                    "create_task",
+                    {
+                        "project_id": "proj_001",
+                        **task_data
+                    },
+                    project_manager
+                )
 
                 assert task_log.action_type_api_name == "create_task"
                 assert task_log.parameters["project_id"] == "proj_001"
 
-            # 创建实际任务对象
-            task = ObjectInstance(
-                object_type_api_name="task",
-                primary_key_value=f"task_{i:03d}",
-                property_values={
-                    "id": f"task_{i:03d}",
-                    "project_id": "proj_001",
-                    "title": task_data["title"],
-                    "description": task_data["description"],
-                    "status": "todo",
-                    "assignee": task_data["assignee"],
-                    "priority": "medium"
-                }
+        # 创建实际任务对象
+        make_task = self.task_type.make_instance
+        tasks = [
+            make_task(
+                f"task_{i:03d}",
+                project_id="proj_001",
+                status="todo",
+                priority="medium",
+                **task_data
             )
-            self.task_service.index_object(task)
+            for i, task_data in enumerate(tasks_data, 1)
+        ]
+        self.task_service.index_objects(tasks)
 
         # Step 3: 验证项目和任务数据
         project_set = self.project_service.get_base_object_set(
@@ -518,9 +532,9 @@ class TestProjectManagementWorkflow:
         assert len(dev_task_set.all()) == 3
 
         # Step 5: 搜索特定任务
-        design_tasks = self.task_service.search(self.task_type, "Design")
-        assert len(design_tasks.all()) == 1
-        assert "Design Database Schema" in design_tasks.all()[0].property_values["title"]
+        design_tasks = self.task_service.search(self.task_type, "Design").all()
+        assert len(design_tasks) == 1
+        assert "Design Database Schema" in design_tasks[0].property_values["title"]
 
         # Step 6: 验证项目与任务的关联
         all_tasks = task_set.all()
@@ -529,23 +543,15 @@ class TestProjectManagementWorkflow:
             assert task.property_values["assignee"] == "dev"
 
         # Step 7: 生成项目报告
-        quiver = Quiver()
-        project_analysis = io.StringIO()
-        with patch('sys.stdout', project_analysis):
-            quiver.analyze(project_set)
-
-        analysis_output = project_analysis.getvalue()
-        assert "--- Quiver Analysis ---" in analysis_output
-        assert "Analyzing 1 objects of type project" in analysis_output
+        quiver = _QUIVER
+        project_report = quiver.analyze(project_set)
+        assert project_report.header == "--- Quiver Analysis ---"
+        assert (project_report.object_count, project_report.type_name) == (1, "project")
 
         # Step 8: 生成任务报告
-        task_analysis = io.StringIO()
-        with patch('sys.stdout', task_analysis):
-            quiver.analyze(task_set)
-
-        task_report = task_analysis.getvalue()
-        assert "--- Quiver Analysis ---" in task_report
-        assert "Analyzing 3 objects of type task" in task_report
+        task_report = quiver.analyze(task_set)
+        assert task_report.header == "--- Quiver Analysis ---"
+        assert (task_report.object_count, task_report.type_name) == (3, "task")
 
         # Step 9: 验证工作流完整性
         project = project_set.all()[0]
@@ -553,42 +559,39 @@ class TestProjectManagementWorkflow:
         assert project.property_values["status"] == "active"
 
         # 验证所有任务都属于这个项目
-        project_tasks = [t for t in task_set.all() if t.property_values["project_id"] == "proj_001"]
-        assert len(project_tasks) == 3
+        assert len(self.task_service.filter_by(self.task_type, "project_id", "proj_001").all()) == 3
 
         # 验证业务规则
-        high_priority_tasks = [t for t in task_set.all() if t.property_values.get("priority") == "high"]
-        assert len(high_priority_tasks) == 0  # 所有任务都是medium优先级
+        assert not any(t.property_values.get("priority") == "high" for t in all_tasks)  # 所有任务都是medium优先级
 
 
 class TestErrorHandlingInBusinessFlow:
     """业务流程中的错误处理测试"""
 
-    def setup_method(self):
-        """初始化测试环境"""
-        self.ontology = Ontology()
-        self.action_service = ActionService(self.ontology)
-        self.logger = get_logger("error_handling_test")
+    @pytest.fixture(scope="class", autouse=True)
+    def world(self, request):
+        """初始化测试环境，每个测试类只构建一次"""
+        cls = request.cls
+        cls.ontology = Ontology()
+        cls.logger = _ERR_LOGGER
 
         # 创建用户类型
-        self.user_type = ObjectType(
-            api_name="user",
-            display_name="User",
-            primary_key="id"
-        )
-        self.user_type.add_property("id", PropertyType.STRING)
-        self.user_type.add_property("email", PropertyType.STRING)
-        self.user_type.add_property("username", PropertyType.STRING)
+        cls.user_type = _make_type("user", "User", ("id", "email", "username"))
 
-        self.ontology.register_object_type(self.user_type)
+        cls.ontology.register_object_type(cls.user_type)
+        # 级联错误用例的 create_order 动作需要目标类型已注册
+        cls.ontology.register_object_type(
+            _make_type("order", "Order", ("id", "customer_id", "items"))
+        )
 
         # 设置严格的权限控制
         acl = AccessControlList()
         acl.grant("admin", PermissionType.EDIT)
-        self.user_type.permissions = acl
+        cls.user_type.permissions = acl
+
+        cls.unauthorized_user = Principal("user", "user")
+        cls.admin_user = Principal("admin", "admin")
 
-    def test_business_flow_error_recovery(self):
-        """测试业务流程中的错误恢复"""
         # 创建需要严格验证的动作
         create_user_action = ActionType(
             api_name="create_user",
@@ -614,53 +617,68 @@ class TestErrorHandlingInBusinessFlow:
             context.create_object("user", user_id, kwargs)
 
         create_user_action.logic = validate_user_logic
-        self.ontology.register_action_type(create_user_action)
+        # 执行动作时检查的是动作自身的 ACL
+        create_user_action.permissions = acl
+        cls.ontology.register_action_type(create_user_action)
 
-        unauthorized_user = Principal("user", "user")
-        admin_user = Principal("admin", "admin")
+    def setup_method(self):
+        """每个测试使用独立的动作服务"""
+        self.action_service = ActionService(self.ontology)
 
-        # 测试1: 权限错误
+    def test_permission_error(self):
+        """测试业务流程中的权限错误"""
         with pytest.raises(PermissionError) as exc_info:
             self.action_service.execute_action(
                 "create_user",
                 {"email": "test@example.com", "username": "testuser"},
-                unauthorized_user
+                self.unauthorized_user
             )
         assert "permission to execute action" in str(exc_info.value)
 
-        # 测试2: 数据验证错误 - 无效邮箱
+    @pytest.mark.parametrize(
+        "email,username,message",
+        [
+            ("invalid_email", "testuser", "Invalid email format"),
+            ("test@example.com", "ab", "Username too short"),
+        ],
+        ids=["invalid_email", "short_username"],
+    )
+    def test_validation_error(self, email, username, message):
+        """测试业务流程中的数据验证错误"""
         with pytest.raises(ValidationError) as exc_info:
             self.action_service.execute_action(
                 "create_user",
-                {"email": "invalid_email", "username": "testuser"},
-                admin_user
+                {"email": email, "username": username},
+                self.admin_user
             )
-        assert "Invalid email format" in str(exc_info.value)
+        assert message in str(exc_info.value)
 
-        # 测试3: 数据验证错误 - 用户名太短
-        with pytest.raises(ValidationError) as exc_info:
-            self.action_service.execute_action(
+    def test_create_user_success(self):
+        """测试验证通过后成功创建用户"""
+        with FrozenClock(1672531200):
+            success_log = self.action_service.execute_action(
                 "create_user",
-                {"email": "test@example.com", "username": "ab"},
-                admin_user
+                {"email": "valid@example.com", "username": "validuser"},
+                self.admin_user
             )
-        assert "Username too short" in str(exc_info.value)
-
-        # 测试4: 成功创建用户
-        with patch('time.time', return_value=1672531200):
-            with patch('uuid.uuid4', return_value='user-uuid-001'):
-                success_log = self.action_service.execute_action(
-                    "create_user",
-                    {"email": "valid@example.com", "username": "validuser"},
-                    admin_user
-                )
 
         assert success_log.action_type_api_name == "create_user"
         assert success_log.parameters["email"] == "valid@example.com"
         assert success_log.changes is not None
 
-    def test_cascade_error_handling(self):
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {"customer_id": "invalid", "items": '[{"product_id": "p1"}]'},
+            {"customer_id": "cust_001", "items": "[]"},
+        ],
+        ids=["invalid_customer_id", "empty_order"],
+    )
+    def test_cascade_error_handling(self, monkeypatch, params):
         """测试级联错误处理"""
+        # 固定随机数，避免模拟的支付失败让测试结果不确定
+        monkeypatch.setattr("random.random", lambda: 1.0)
+
         # 创建依赖关系复杂的业务动作
         create_order_action = ActionType(
             api_name="create_order",
@@ -698,22 +716,6 @@ class TestErrorHandlingInBusinessFlow:
         create_order_action.logic = complex_order_logic
         self.ontology.register_action_type(create_order_action)
 
-        admin_user = Principal("admin", "admin")
-
-        # 测试级联错误
-        test_cases = [
-            {
-                "name": "Invalid Customer ID",
-                "params": {"customer_id": "invalid", "items": '[{"product_id": "p1"}]'},
-                "expected_error": ValidationError
-            },
-            {
-                "name": "Empty Order",
-                "params": {"customer_id": "cust_001", "items": "[]"},
-                "expected_error": ValidationError
-            }
-        ]
-
-        for case in test_cases:
-            with pytest.raises(case["expected_error"]):
-                self.action_service.execute_action("create_order", case["params"], admin_user)
\ No newline at end of file
+        # 两种用例都应在业务校验阶段失败
+        with pytest.raises(ValidationError):
+            self.action_service.execute_action("create_order", params, self.admin_user)
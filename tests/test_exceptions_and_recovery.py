@@ -2,9 +2,6 @@
 # 测试统一异常类层次结构和错误恢复机制
 
 import pytest
-import time
-from typing import Any, Dict
-from unittest.mock import Mock, patch
 
 from src.ontology_framework.exceptions import (
     OntologyError, ValidationError, PermissionError, NotFoundError,
@@ -25,6 +22,30 @@ from src.ontology_framework.error_recovery import (
 )
 
 
+@pytest.fixture
+def no_sleep(monkeypatch):
+    """重试退避不真正等待，控制流不变"""
+    monkeypatch.setattr("src.ontology_framework.error_recovery.time.sleep", lambda *_: None)
+
+
+@pytest.fixture(scope="module")
+def _shared_collector():
+    return ErrorCollector()
+
+
+@pytest.fixture
+def collector(_shared_collector):
+    """整个模块复用一个 ErrorCollector，每个测试结束后清空"""
+    yield _shared_collector
+    _shared_collector.clear()
+
+
+@pytest.fixture(scope="module")
+def shared_breaker():
+    """参数化用例共用的熔断器，多次成功调用在同一实例上累积"""
+    return CircuitBreaker(CircuitBreakerConfig(failure_threshold=5, recovery_timeout=1.0))
+
+
 class TestOntologyError:
     """OntologyError基础异常测试"""
 
@@ -71,111 +92,88 @@ class TestOntologyError:
         assert str(error) == "[ERR_001] Test message"
 
 
-class TestSpecificExceptions:
-    """具体异常类测试"""
-
-    def test_validation_error(self):
-        """测试ValidationError"""
-        error = ValidationError(
-            message="Invalid email format",
-            field_name="email",
-            field_value="invalid_email",
-            expected_type="email"
-        )
-
-        assert error.category == ErrorCategory.VALIDATION
-        assert error.details["field_name"] == "email"
-        assert error.details["field_value"] == "invalid_email"
-        assert error.details["expected_type"] == "email"
-
-    def test_permission_error(self):
-        """测试PermissionError"""
-        error = PermissionError(
-            message="Access denied",
-            principal_id="user_123",
-            resource_type="document",
-            required_permission="EDIT"
-        )
-
-        assert error.category == ErrorCategory.PERMISSION
-        assert error.severity == ErrorSeverity.HIGH
-        assert error.details["principal_id"] == "user_123"
-        assert error.details["resource_type"] == "document"
-        assert error.details["required_permission"] == "EDIT"
-
-    def test_not_found_error(self):
-        """测试NotFoundError"""
-        error = NotFoundError(
-            message="User not found",
-            resource_type="User",
-            resource_id="user_456"
-        )
-
-        assert error.category == ErrorCategory.NOT_FOUND
-        assert error.severity == ErrorSeverity.MEDIUM
-        assert error.details["resource_type"] == "User"
-        assert error.details["resource_id"] == "user_456"
-
-    def test_business_logic_error(self):
-        """测试BusinessLogicError"""
-        error = BusinessLogicError(
-            message="Cannot delete user with active orders",
-            business_rule="USER_DELETE_RESTRICTION",
-            operation="delete_user"
-        )
+_SPECIFIC_EXCEPTION_CASES = [
+    (
+        ValidationError,
+        dict(message="Invalid email format", field_name="email",
+             field_value="invalid_email", expected_type="email"),
+        ErrorCategory.VALIDATION,
+        None,
+        {"field_name": "email", "field_value": "invalid_email", "expected_type": "email"},
+    ),
+    (
+        PermissionError,
+        dict(message="Access denied", principal_id="user_123",
+             resource_type="document", required_permission="EDIT"),
+        ErrorCategory.PERMISSION,
+        ErrorSeverity.HIGH,
+        {"principal_id": "user_123", "resource_type": "document", "required_permission": "EDIT"},
+    ),
+    (
+        NotFoundError,
+        dict(message="User not found", resource_type="User", resource_id="user_456"),
+        ErrorCategory.NOT_FOUND,
+        ErrorSeverity.MEDIUM,
+        {"resource_type": "User", "resource_id": "user_456"},
+    ),
+    (
+        BusinessLogicError,
+        dict(message="Cannot delete user with active orders",
+             business_rule="USER_DELETE_RESTRICTION", operation="delete_user"),
+        ErrorCategory.BUSINESS,
+        None,
+        {"business_rule": "USER_DELETE_RESTRICTION", "operation": "delete_user"},
+    ),
+    (
+        ConfigurationError,
+        dict(message="Missing database configuration", config_key="database.url"),
+        ErrorCategory.CONFIGURATION,
+        ErrorSeverity.HIGH,
+        {"config_key": "database.url"},
+    ),
+    (
+        IntegrationError,
+        dict(message="External API call failed", service_name="payment_gateway",
+             operation="charge", status_code=500),
+        ErrorCategory.INTEGRATION,
+        ErrorSeverity.HIGH,
+        {"service_name": "payment_gateway", "operation": "charge", "status_code": "500"},
+    ),
+    (
+        PerformanceError,
+        dict(message="Query timeout exceeded", operation="complex_search",
+             threshold=5.0, actual_value=8.5),
+        ErrorCategory.PERFORMANCE,
+        None,
+        {"operation": "complex_search", "threshold": "5.0", "actual_value": "8.5"},
+    ),
+]
 
-        assert error.category == ErrorCategory.BUSINESS
-        assert error.details["business_rule"] == "USER_DELETE_RESTRICTION"
-        assert error.details["operation"] == "delete_user"
 
-    def test_configuration_error(self):
-        """测试ConfigurationError"""
-        error = ConfigurationError(
-            message="Missing database configuration",
-            config_key="database.url"
-        )
-
-        assert error.category == ErrorCategory.CONFIGURATION
-        assert error.severity == ErrorSeverity.HIGH
-        assert error.details["config_key"] == "database.url"
-
-    def test_integration_error(self):
-        """测试IntegrationError"""
-        error = IntegrationError(
-            message="External API call failed",
-            service_name="payment_gateway",
-            operation="charge",
-            status_code=500
-        )
+class TestSpecificExceptions:
+    """具体异常类测试"""
 
-        assert error.category == ErrorCategory.INTEGRATION
-        assert error.severity == ErrorSeverity.HIGH
-        assert error.details["service_name"] == "payment_gateway"
-        assert error.details["operation"] == "charge"
-        assert error.details["status_code"] == "500"
-
-    def test_performance_error(self):
-        """测试PerformanceError"""
-        error = PerformanceError(
-            message="Query timeout exceeded",
-            operation="complex_search",
-            threshold=5.0,
-            actual_value=8.5
-        )
+    @pytest.mark.parametrize(
+        "exc_cls,kwargs,category,severity,details",
+        _SPECIFIC_EXCEPTION_CASES,
+        ids=[case[0].__name__ for case in _SPECIFIC_EXCEPTION_CASES],
+    )
+    def test_specific_exception(self, exc_cls, kwargs, category, severity, details):
+        """测试各具体异常的分类、严重级别和详情字段"""
+        error = exc_cls(**kwargs)
 
-        assert error.category == ErrorCategory.PERFORMANCE
-        assert error.details["operation"] == "complex_search"
-        assert error.details["threshold"] == "5.0"
-        assert error.details["actual_value"] == "8.5"
+        assert error.category == category
+        if severity is not None:
+            assert error.severity == severity
+        for key, value in details.items():
+            assert error.details[key] == value
 
 
 class TestErrorCollector:
     """ErrorCollector测试"""
 
-    def test_error_collector_basic_operations(self):
+    def test_error_collector_basic_operations(self, collector):
         """测试ErrorCollector基础操作"""
-        collector = ErrorCollector()
-
         assert not collector.has_errors()
         assert not collector.has_warnings()
 
@@ -198,10 +196,8 @@ class TestErrorCollector:
         assert len(collector.warnings) == 1
         assert len(collector.get_all()) == 3
 
-    def test_error_collector_filtering(self):
+    def test_error_collector_filtering(self, collector):
         """测试ErrorCollector过滤功能"""
-        collector = ErrorCollector()
-
         # 添加不同类型和严重程度的错误
         collector.add_error(ValidationError("Validation error"))
         collector.add_error(PermissionError("Permission error"))
@@ -219,10 +215,26 @@ class TestErrorCollector:
         validation_errors = collector.get_by_category(ErrorCategory.VALIDATION)
         assert len(validation_errors) == 2
 
-    def test_error_collector_clear(self):
+    def test_error_collector_filter_scales(self, collector):
+        """测试分类/严重程度索引与线性过滤结果一致（含顺序）"""
+        for i in range(10_000):
+            collector.add_error(ValidationError(f"v{i}") if i % 2 else PermissionError(f"p{i}"))
+        collector.add_warning(ValidationError("w"))
+
+        everything = collector.get_all()
+        for category in ErrorCategory:
+            assert collector.get_by_category(category) == [
+                e for e in everything if e.category == category
+            ]
+        for severity in ErrorSeverity:
+            assert collector.get_by_severity(severity) == [
+                e for e in everything if e.severity == severity
+            ]
+        assert len(collector.get_by_category(ErrorCategory.VALIDATION)) == 5_001
+        assert collector.get_by_category(ErrorCategory.SYSTEM) == []
+
+    def test_error_collector_clear(self, collector):
         """测试ErrorCollector清空功能"""
-        collector = ErrorCollector()
-
         collector.add_error(ValidationError("Error"))
         collector.add_warning(ValidationError("Warning"))
 
@@ -235,11 +247,10 @@ class TestErrorCollector:
         assert not collector.has_warnings()
         assert len(collector.errors) == 0
         assert len(collector.warnings) == 0
+        assert collector.get_by_category(ErrorCategory.VALIDATION) == []
 
-    def test_error_collector_to_dict_list(self):
+    def test_error_collector_to_dict_list(self, collector):
         """测试ErrorCollector转换为字典列表"""
-        collector = ErrorCollector()
-
         error = ValidationError("Test error", error_code="TEST_001")
         collector.add_error(error)
 
@@ -262,6 +273,17 @@ class TestExceptionUtilities:
         assert handled_error == original_error
         assert handled_error.context["additional"] == "context"
 
+    def test_handle_exception_ontology_zero_alloc(self):
+        """测试OntologyError直通：返回原对象，context原地更新"""
+        original_error = ValidationError("x")
+        original_context = original_error.context
+
+        handled_error = handle_exception(original_error, {"k": "v"})
+
+        assert handled_error is original_error
+        assert handled_error.context is original_context
+        assert handled_error.context["k"] == "v"
+
     def test_handle_exception_with_regular_exception(self):
         """测试handle_exception处理普通异常"""
         original_error = ValueError("Regular error")
@@ -331,7 +353,10 @@ class TestCircuitBreaker:
 
     def test_circuit_breaker_failure_and_trip(self):
         """测试熔断器失败和触发"""
-        config = CircuitBreakerConfig(failure_threshold=2, recovery_timeout=0.1)
+        clock = [0.0]
+        config = CircuitBreakerConfig(
+            failure_threshold=2, recovery_timeout=0.1, time_fn=lambda: clock[0]
+        )
         breaker = CircuitBreaker(config)
 
         def failing_func():
@@ -351,7 +376,10 @@ class TestCircuitBreaker:
 
     def test_circuit_breaker_open_state(self):
         """测试熔断器打开状态"""
-        config = CircuitBreakerConfig(failure_threshold=1, recovery_timeout=0.1)
+        clock = [0.0]
+        config = CircuitBreakerConfig(
+            failure_threshold=1, recovery_timeout=0.1, time_fn=lambda: clock[0]
+        )
         breaker = CircuitBreaker(config)
 
         def failing_func():
@@ -369,7 +397,37 @@ class TestCircuitBreaker:
 
         assert "CIRCUIT_BREAKER_OPEN" in str(exc_info.value)
 
+    def test_circuit_breaker_recovers_through_half_open(self):
+        """测试注入时钟推进后 OPEN→HALF_OPEN→CLOSED"""
+        clock = [0.0]
+        config = CircuitBreakerConfig(
+            failure_threshold=1,
+            recovery_timeout=0.1,
+            success_threshold=2,
+            time_fn=lambda: clock[0],
+        )
+        breaker = CircuitBreaker(config)
+
+        def failing_func():
+            raise ValueError("Test failure")
 
+        with pytest.raises(ValueError):
+            breaker.call(failing_func)
+        assert breaker.state == CircuitBreakerState.OPEN
+
+        clock[0] += 0.05
+        with pytest.raises(OntologyError):
+            breaker.call(lambda: "ok")
+
+        clock[0] += 0.1
+        assert breaker.call(lambda: "ok") == "ok"
+        assert breaker.state == CircuitBreakerState.HALF_OPEN
+
+        assert breaker.call(lambda: "ok") == "ok"
+        assert breaker.state == CircuitBreakerState.CLOSED
+
+
+@pytest.mark.usefixtures("no_sleep")
 class TestRetryMechanism:
     """重试机制测试"""
 
@@ -384,6 +442,24 @@ class TestRetryMechanism:
         result = retry.execute_with_retry(success_func)
         assert result == "success"
 
+    def test_retry_fast_path_no_try_except(self, monkeypatch):
+        """测试单次尝试且无 retry_on 时直接调用，不进入重试循环"""
+        def _forbidden(*_):
+            raise AssertionError("retry loop should be bypassed")
+
+        monkeypatch.setattr("src.ontology_framework.error_recovery.time.sleep", _forbidden)
+        config = RetryConfig(max_attempts=1, retry_on=[])
+        retry = RetryMechanism(config)
+        monkeypatch.setattr(retry, "_should_retry", _forbidden)
+
+        assert retry.execute_with_retry(lambda x: x * 2, 21) == 42
+
+        def failing_func():
+            raise ValueError("Raw failure")
+
+        with pytest.raises(ValueError, match="Raw failure"):
+            retry.execute_with_retry(failing_func)
+
     def test_retry_success_after_failure(self):
         """测试重试机制失败后成功"""
         config = RetryConfig(max_attempts=3, base_delay=0.01, jitter=False)
@@ -448,7 +524,12 @@ class TestFallbackHandler:
 
     def test_fallback_with_function(self):
         """测试使用降级函数"""
-        fallback_func = Mock(return_value="fallback_result")
+        calls = []
+
+        def fallback_func(*args, **kwargs):
+            calls.append((args, kwargs))
+            return "fallback_result"
+
         config = FallbackConfig(fallback_function=fallback_func)
         fallback = FallbackHandler(config)
 
@@ -457,7 +538,7 @@ class TestFallbackHandler:
 
         result = fallback.execute_with_fallback(failing_func)
         assert result == "fallback_result"
-        fallback_func.assert_called_once()
+        assert len(calls) == 1
 
     def test_fallback_with_value(self):
         """测试使用降级值"""
@@ -482,6 +563,7 @@ class TestFallbackHandler:
             fallback.execute_with_fallback(failing_func)
 
 
+@pytest.mark.usefixtures("no_sleep")
 class TestErrorRecoveryManager:
     """错误恢复管理器测试"""
 
@@ -503,6 +585,20 @@ class TestErrorRecoveryManager:
         assert "test_circuit" in manager.circuit_breakers
         assert "test_fallback" in manager.fallback_handlers
 
+    def test_register_idempotent(self):
+        """测试同名同配置重复注册复用已有实例，配置变化时替换"""
+        manager = ErrorRecoveryManager()
+        retry_config = RetryConfig(max_attempts=2, base_delay=0.01, jitter=False)
+
+        manager.register_retry_mechanism("r", retry_config)
+        first = manager.retry_mechanisms["r"]
+        manager.register_retry_mechanism("r", RetryConfig(max_attempts=2, base_delay=0.01, jitter=False))
+        assert manager.retry_mechanisms["r"] is first
+
+        manager.register_retry_mechanism("r", RetryConfig(max_attempts=5))
+        assert manager.retry_mechanisms["r"] is not first
+        assert manager.retry_mechanisms["r"].config.max_attempts == 5
+
     def test_recovery_manager_status(self):
         """测试恢复管理器状态"""
         manager = ErrorRecoveryManager()
@@ -515,40 +611,50 @@ class TestErrorRecoveryManager:
         assert "test" in status["circuit_breakers"]
 
 
+# 装饰后的目标函数在模块级构建一次；调用计数放在 dict 中，由夹具逐个测试重置
+_retry_state = {"calls": 0}
+
+
+@with_retry(max_attempts=3, base_delay=0.01, config_name="test_decorators_retry")
+def _retry_target():
+    _retry_state["calls"] += 1
+    if _retry_state["calls"] < 2:
+        raise ValueError("Temporary failure")
+    return "success"
+
+
+@with_circuit_breaker(failure_threshold=2, recovery_timeout=0.1, config_name="test_decorators_cb")
+def _cb_target():
+    raise ValueError("Always fails")
+
+
+@pytest.mark.usefixtures("no_sleep")
 class TestDecorators:
     """装饰器测试"""
 
+    @pytest.fixture(autouse=True)
+    def _reset_state(self):
+        """重置调用计数；丢弃上次注册的熔断器，下次调用时以 CLOSED 状态重建"""
+        _retry_state["calls"] = 0
+        recovery_manager.circuit_breakers.pop("test_decorators_cb", None)
+
     def test_with_retry_decorator(self):
         """测试重试装饰器"""
-        call_count = 0
-
-        @with_retry(max_attempts=3, base_delay=0.01)
-        def failing_function():
-            nonlocal call_count
-            call_count += 1
-            if call_count < 2:
-                raise ValueError("Temporary failure")
-            return "success"
-
-        result = failing_function()
+        result = _retry_target()
         assert result == "success"
-        assert call_count == 2
+        assert _retry_state["calls"] == 2
 
     def test_with_circuit_breaker_decorator(self):
         """测试熔断器装饰器"""
-        @with_circuit_breaker(failure_threshold=2, recovery_timeout=0.1)
-        def failing_function():
-            raise ValueError("Always fails")
-
         # 前两次调用触发熔断
         with pytest.raises(ValueError):
-            failing_function()
+            _cb_target()
         with pytest.raises(ValueError):
-            failing_function()
+            _cb_target()
 
         # 第三次调用应该被熔断器阻止
         with pytest.raises(OntologyError) as exc_info:
-            failing_function()
+            _cb_target()
         assert "CIRCUIT_BREAKER_OPEN" in str(exc_info.value)
 
     def test_with_fallback_decorator(self):
@@ -629,16 +735,12 @@ class TestEdgeCasesAndErrorHandling:
             handled = handle_exception(e)
             assert handled.message == "An unexpected error occurred"
 
-    def test_circuit_breaker_without_failures(self):
-        """测试没有失败的熔断器"""
-        config = CircuitBreakerConfig(failure_threshold=5, recovery_timeout=1.0)
-        breaker = CircuitBreaker(config)
-
-        # 成功调用应该保持熔断器关闭
-        for i in range(10):
-            result = breaker.call(lambda: f"success_{i}")
-            assert breaker.state == CircuitBreakerState.CLOSED
-            assert breaker.failure_count == 0
+    @pytest.mark.parametrize("i", range(10))
+    def test_circuit_breaker_without_failures(self, i, shared_breaker):
+        """测试没有失败的熔断器：共享实例上累计的成功调用应保持熔断器关闭"""
+        assert shared_breaker.call(lambda: f"success_{i}") == f"success_{i}"
+        assert shared_breaker.state == CircuitBreakerState.CLOSED
+        assert shared_breaker.failure_count == 0
 
     def test_retry_with_zero_attempts(self):
         """测试零次重试配置"""
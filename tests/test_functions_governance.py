@@ -1,3 +1,4 @@
+import copy
 from typing import Dict
 
 import pytest
@@ -26,6 +27,21 @@ def _build_order_type() -> ObjectType:
     )
 
 
+# 模块级 schema：导入时构建一次。注册会冻结类型（幂等），因此可直接共享。
+_ORDER_TYPE = _build_order_type()
+_DEVICE_TYPE = (
+    ObjectType(api_name="Device", display_name="Device", primary_key="device_id")
+    .add_property("device_id", PropertyType.STRING)
+    .add_property("name", PropertyType.STRING)
+)
+_STATUS_TYPE = (
+    ObjectType(api_name="Status", display_name="Status", primary_key="status_id")
+    .add_property("status_id", PropertyType.STRING)
+    .add_property("device_id", PropertyType.STRING)
+    .add_property("health", PropertyType.INTEGER)
+)
+
+
 def _register_function(
     ontology: Ontology, api_name: str, inputs: Dict[str, ObjectTypeSpec], logic
 ):
@@ -35,20 +51,23 @@ def _register_function(
     ontology.register_function(fn)
 
 
-def test_link_validation_filters_objects():
+@pytest.fixture(scope="module")
+def base_ontology() -> Ontology:
+    """Schema shared by every test in this module, registered once."""
     ontology = Ontology()
-    device_type = (
-        ObjectType(api_name="Device", display_name="Device", primary_key="device_id")
-        .add_property("device_id", PropertyType.STRING)
-        .add_property("name", PropertyType.STRING)
-    )
-    status_type = (
-        ObjectType(api_name="Status", display_name="Status", primary_key="status_id")
-        .add_property("status_id", PropertyType.STRING)
-        .add_property("device_id", PropertyType.STRING)
-    )
-    ontology.register_object_type(device_type)
-    ontology.register_object_type(status_type)
+    for object_type in (_ORDER_TYPE, _DEVICE_TYPE, _STATUS_TYPE):
+        ontology.register_object_type(object_type)
+    return ontology
+
+
+@pytest.fixture
+def ontology(base_ontology: Ontology) -> Ontology:
+    """Private copy for tests that add objects, links or functions."""
+    return copy.deepcopy(base_ontology)
+
+
+def test_link_validation_filters_objects(ontology):
+    device_type = ontology.get_object_type("Device")
 
     link = LinkType(
         api_name="DeviceHasStatus",
@@ -89,19 +108,8 @@ def test_link_validation_filters_objects():
     assert results[0].primary_key_value == "st-1"
 
 
-def test_link_scoring_annotations():
-    ontology = Ontology()
-    device_type = (
-        ObjectType(api_name="Device", display_name="Device", primary_key="device_id")
-        .add_property("device_id", PropertyType.STRING)
-    )
-    status_type = (
-        ObjectType(api_name="Status", display_name="Status", primary_key="status_id")
-        .add_property("status_id", PropertyType.STRING)
-        .add_property("health", PropertyType.INTEGER)
-    )
-    ontology.register_object_type(device_type)
-    ontology.register_object_type(status_type)
+def test_link_scoring_annotations(ontology):
+    device_type = ontology.get_object_type("Device")
 
     link = LinkType(
         api_name="DeviceHasStatus",
@@ -132,11 +140,7 @@ def test_link_scoring_annotations():
     assert annotated.get_annotation("function_scores")["DeviceHasStatus"] == 87
 
 
-def test_osdk_enforces_function_contracts():
-    ontology = Ontology()
-    order_type = _build_order_type()
-    ontology.register_object_type(order_type)
-
+def test_osdk_enforces_function_contracts(ontology):
     order = ObjectInstance(
         "order",
         "ord-1",
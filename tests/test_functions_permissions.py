@@ -14,13 +14,43 @@ from src.ontology_framework.permissions import (
 )
 
 
+_PERMISSION_VALUES = [
+    (PermissionType.VIEW, "view"),
+    (PermissionType.EDIT, "edit"),
+    (PermissionType.DELETE, "delete"),
+    (PermissionType.OWNER, "owner"),
+]
+
+
+@pytest.fixture(scope="module")
+def _shared_registry():
+    return FunctionRegistry()
+
+
+@pytest.fixture(scope="module")
+def _shared_acl():
+    return AccessControlList()
+
+
+@pytest.fixture
+def registry(_shared_registry):
+    """模块内复用一个 FunctionRegistry，每个测试结束后清空"""
+    yield _shared_registry
+    _shared_registry.clear()
+
+
+@pytest.fixture
+def acl(_shared_acl):
+    """模块内复用一个 AccessControlList，每个测试结束后撤销全部授权"""
+    yield _shared_acl
+    _shared_acl.clear()
+
+
 class TestFunctionRegistryExtended:
     """FunctionRegistry扩展测试"""
 
-    def test_function_registry_decorator_registration(self):
+    def test_function_registry_decorator_registration(self, registry):
         """测试FunctionRegistry装饰器注册"""
-        registry = FunctionRegistry()
-
         # 使用装饰器注册函数
         @registry.register("test_func", display_name="测试函数")
         def dummy_logic():
@@ -35,10 +65,8 @@ class TestFunctionRegistryExtended:
         assert registered_func.display_name == "测试函数"
         assert registered_func.logic == dummy_logic
 
-    def test_function_registry_clear_and_pending(self):
+    def test_function_registry_clear_and_pending(self, registry):
         """测试FunctionRegistry清除和待注册函数"""
-        registry = FunctionRegistry()
-
         # 使用装饰器注册函数
         @registry.register("func1", display_name="函数1")
         def func1():
@@ -59,10 +87,8 @@ class TestFunctionRegistryExtended:
         pending_after = registry.get_pending_functions()
         assert len(pending_after) == 0
 
-    def test_function_registry_remove_function(self):
+    def test_function_registry_remove_function(self, registry):
         """测试FunctionRegistry删除函数"""
-        registry = FunctionRegistry()
-
         # 添加函数
         @registry.register("test_func", display_name="测试函数")
         def test_func():
@@ -82,10 +108,8 @@ class TestFunctionRegistryExtended:
         removed = registry.remove_function("nonexistent")
         assert removed is False
 
-    def test_function_registry_with_inputs(self):
+    def test_function_registry_with_inputs(self, registry):
         """测试FunctionRegistry带输入参数的函数"""
-        registry = FunctionRegistry()
-
         @registry.register(
             "func_with_inputs",
             display_name="带输入的函数",
@@ -175,10 +199,8 @@ class TestFunctionRegistryExtended:
 class TestAccessControlListExtended:
     """AccessControlList扩展测试"""
 
-    def test_acl_basic_operations(self):
+    def test_acl_basic_operations(self, acl):
         """测试ACL基础操作"""
-        acl = AccessControlList()
-
         # 初始状态
         assert not acl.check("user1", PermissionType.VIEW)
         assert not acl.check("user1", PermissionType.EDIT)
@@ -200,26 +222,16 @@ class TestAccessControlListExtended:
         assert acl.check("user2", PermissionType.DELETE)
         assert not acl.check("user2", PermissionType.VIEW)
 
-    def test_acl_permission_groups(self):
-        """测试ACL权限分组"""
-        acl = AccessControlList()
+    @pytest.mark.parametrize("permission", list(PermissionType))
+    def test_acl_permission_groups(self, acl, permission):
+        """测试ACL权限分组：同一用户持有全部权限时逐个可查"""
+        for perm in PermissionType:
+            acl.grant("admin", perm)
 
-        # 为一个用户授予多个权限
-        acl.grant("admin", PermissionType.VIEW)
-        acl.grant("admin", PermissionType.EDIT)
-        acl.grant("admin", PermissionType.DELETE)
-        acl.grant("admin", PermissionType.OWNER)
-
-        # 验证所有权限
-        assert acl.check("admin", PermissionType.VIEW)
-        assert acl.check("admin", PermissionType.EDIT)
-        assert acl.check("admin", PermissionType.DELETE)
-        assert acl.check("admin", PermissionType.OWNER)
+        assert acl.check("admin", permission)
 
-    def test_acl_duplicate_grants(self):
+    def test_acl_duplicate_grants(self, acl):
         """测试重复授权不会重复添加"""
-        acl = AccessControlList()
-
         # 多次授予相同权限
         acl.grant("user1", PermissionType.VIEW)
         acl.grant("user1", PermissionType.VIEW)
@@ -230,10 +242,8 @@ class TestAccessControlListExtended:
         assert len(user1_perms) == 1
         assert PermissionType.VIEW in user1_perms
 
-    def test_acl_permissions_structure(self):
+    def test_acl_permissions_structure(self, acl):
         """测试ACL权限数据结构"""
-        acl = AccessControlList()
-
         # 授予多种权限
         acl.grant("user1", PermissionType.VIEW)
         acl.grant("user1", PermissionType.EDIT)
@@ -250,6 +260,44 @@ class TestAccessControlListExtended:
         assert PermissionType.VIEW in user1_perms
         assert PermissionType.EDIT in user1_perms
 
+    def test_acl_initial_permissions_are_checked(self):
+        """测试构造时传入的权限同样参与检查"""
+        acl = AccessControlList(permissions={"user1": [PermissionType.VIEW, PermissionType.OWNER]})
+
+        assert acl.check("user1", PermissionType.VIEW)
+        assert acl.check("user1", PermissionType.OWNER)
+        assert not acl.check("user1", PermissionType.EDIT)
+
+        acl.grant("user1", PermissionType.VIEW)
+        assert acl.permissions["user1"] == [PermissionType.VIEW, PermissionType.OWNER]
+
+        acl.clear()
+        assert acl.permissions == {}
+        assert not acl.check("user1", PermissionType.VIEW)
+
+    def test_permission_bits_are_distinct(self):
+        """测试每种权限占用互不重叠的单个位"""
+        bits = [perm.bit for perm in PermissionType]
+        assert all(bit and bit & (bit - 1) == 0 for bit in bits)
+        assert len(set(bits)) == len(bits)
+
+    def test_acl_check_all(self):
+        """测试一次检查多个权限"""
+        acl = AccessControlList(permissions={"user1": [PermissionType.VIEW, PermissionType.EDIT]})
+
+        assert acl.check_all("user1", [PermissionType.VIEW, PermissionType.EDIT])
+        assert not acl.check_all("user1", [PermissionType.VIEW, PermissionType.DELETE])
+        assert not acl.check_all("ghost", [PermissionType.VIEW])
+        assert acl.check_all("ghost", [])
+
+    def test_acl_check_each(self):
+        """测试逐个返回多个权限的检查结果"""
+        acl = AccessControlList(permissions={"user1": [PermissionType.VIEW, PermissionType.DELETE]})
+
+        perms = [PermissionType.VIEW, PermissionType.EDIT, PermissionType.DELETE]
+        assert acl.check_each("user1", perms) == [True, False, True]
+        assert acl.check_each("ghost", perms) == [False, False, False]
+
 
 class TestPrincipalExtended:
     """Principal扩展测试"""
@@ -290,12 +338,10 @@ class TestPrincipalExtended:
 class TestPermissionTypeExtended:
     """PermissionType扩展测试"""
 
-    def test_permission_type_values(self):
+    @pytest.mark.parametrize("member,expected", _PERMISSION_VALUES)
+    def test_permission_type_values(self, member, expected):
         """测试PermissionType枚举值"""
-        assert PermissionType.VIEW.value == "view"
-        assert PermissionType.EDIT.value == "edit"
-        assert PermissionType.DELETE.value == "delete"
-        assert PermissionType.OWNER.value == "owner"
+        assert member.value == expected
 
     def test_permission_type_comparison(self):
         """测试PermissionType比较"""
@@ -308,12 +354,7 @@ class TestPermissionTypeExtended:
 
     def test_permission_type_iteration(self):
         """测试PermissionType枚举迭代"""
-        permission_types = list(PermissionType)
-        assert len(permission_types) == 4
-        assert PermissionType.VIEW in permission_types
-        assert PermissionType.EDIT in permission_types
-        assert PermissionType.DELETE in permission_types
-        assert PermissionType.OWNER in permission_types
+        assert list(PermissionType) == [member for member, _ in _PERMISSION_VALUES]
 
 
 class TestFunctionPermissionsIntegration:
@@ -391,10 +432,8 @@ class TestFunctionPermissionsIntegration:
 class TestEdgeCasesAndErrorHandling:
     """边缘情况和错误处理测试"""
 
-    def test_function_registry_edge_cases(self):
+    def test_function_registry_edge_cases(self, registry):
         """测试FunctionRegistry边缘情况"""
-        registry = FunctionRegistry()
-
         # 注册空函数名函数 - 使用装饰器可能不会抛出异常
         try:
             @registry.register("", display_name="空名称函数")
@@ -410,10 +449,8 @@ class TestEdgeCasesAndErrorHandling:
         assert not registry.has_function("nonexistent")
         assert registry.remove_function("nonexistent") is False
 
-    def test_acl_edge_cases(self):
+    def test_acl_edge_cases(self, acl):
         """测试ACL边缘情况"""
-        acl = AccessControlList()
-
         # 检查不存在用户的权限
         assert not acl.check("", PermissionType.VIEW)
         assert not acl.check(None, PermissionType.VIEW)  # 如果允许None作为参数
@@ -1,11 +1,10 @@
 # 模块间集成测试
 # 测试 core、services、applications、exceptions、logging 等模块之间的集成
 
+import itertools
+import json
+import logging
 import pytest
-import time
-import uuid
-from unittest.mock import Mock, patch
-import io
 
 from ontology_framework.core import (
     ObjectType,
@@ -34,90 +33,141 @@ from ontology_framework.logging_config import (
 )
 
 
+@pytest.fixture(scope="module")
+def ten_products():
+    """用于分析的 10 个产品实例，模块内只构建一次"""
+    return tuple(
+        ObjectInstance(
+            "product",
+            f"p{i:03d}",
+            {
+                "id": f"p{i:03d}",
+                "name": f"Product {i}",
+                "price": f"{i * 10}.99",
+                "category": f"Category {i % 3}",
+            },
+        )
+        for i in range(10)
+    )
+
+
+# 调用方只读使用的主体，模块内共享
+@pytest.fixture(scope="module")
+def manager():
+    return Principal("manager", "manager")
+
+
+@pytest.fixture(scope="module")
+def admin():
+    return Principal("admin", "admin")
+
+
+@pytest.fixture(scope="module")
+def hr_manager():
+    return Principal("hr_manager", "hr")
+
+
+@pytest.fixture(scope="module")
+def unauthorized_user():
+    return Principal("user", "user")
+
+
+@pytest.fixture(scope="module")
+def sample_employees():
+    """模块内共享的员工实例，只读使用"""
+    return [
+        ObjectInstance(
+            "employee",
+            f"emp{i:03d}",
+            {"id": f"emp{i:03d}", "name": name, "department": department, "salary": salary},
+        )
+        for i, (name, department, salary) in enumerate(
+            [
+                ("Alice Johnson", "Engineering", "100000"),
+                ("Bob Smith", "Finance", "80000"),
+                ("Charlie Brown", "Engineering", "90000"),
+            ],
+            start=1,
+        )
+    ]
+
+
 class TestCoreServicesIntegration:
     """测试核心模块与服务模块的集成"""
 
-    def setup_method(self):
-        """每个测试前的设置"""
-        self.ontology = Ontology()
-        self.object_set_service = ObjectSetService()
-        self.action_service = ActionService(self.ontology)
+    @pytest.fixture(scope="class", autouse=True)
+    def world(self, request):
+        """本体、员工类型和招聘动作每个测试类只构建一次"""
+        cls = request.cls
+        cls.ontology = Ontology()
 
         # 创建测试对象类型
-        self.employee_type = ObjectType(
+        cls.employee_type = ObjectType(
             api_name="employee",
             display_name="Employee",
             primary_key="id"
         )
-        self.employee_type.add_property("id", PropertyType.STRING)
-        self.employee_type.add_property("name", PropertyType.STRING)
-        self.employee_type.add_property("department", PropertyType.STRING)
-        self.employee_type.add_property("salary", PropertyType.STRING)
+        cls.employee_type.add_properties({
+            "id": PropertyType.STRING,
+            "name": PropertyType.STRING,
+            "department": PropertyType.STRING,
+            "salary": PropertyType.STRING,
+        })
 
         # 注册对象类型
-        self.ontology.register_object_type(self.employee_type)
+        cls.ontology.register_object_type(cls.employee_type)
 
         # 创建测试动作类型
-        self.hire_action = ActionType(
+        cls.hire_action = ActionType(
             api_name="hire_employee",
             display_name="Hire Employee",
             target_object_types=["employee"]
         )
-        self.hire_action.add_parameter("name", "string", required=True)
-        self.hire_action.add_parameter("department", "string", required=True)
-        self.hire_action.add_parameter("salary", "string", required=False)
+        cls.hire_action.add_parameter("name", "string", required=True)
+        cls.hire_action.add_parameter("department", "string", required=True)
+        cls.hire_action.add_parameter("salary", "string", required=False)
 
         # 注册动作类型
-        self.ontology.register_action_type(self.hire_action)
+        cls.ontology.register_action_type(cls.hire_action)
 
-    def test_ontology_object_set_service_integration(self):
-        """测试Ontology与ObjectSetService的集成"""
-        # 创建对象实例
-        employee = ObjectInstance(
-            object_type_api_name="employee",
-            primary_key_value="emp001",
-            property_values={
-                "id": "emp001",
-                "name": "Alice",
-                "department": "Engineering",
-                "salary": "100000"
-            }
-        )
+    def setup_method(self):
+        """每个测试使用独立的服务实例"""
+        self.object_set_service = ObjectSetService()
+        self.action_service = ActionService(self.ontology)
 
+    def test_ontology_object_set_service_integration(self, sample_employees):
+        """测试Ontology与ObjectSetService的集成"""
         # 索引对象
-        self.object_set_service.index_object(employee)
+        self.object_set_service.index_object(sample_employees[0])
 
         # 获取对象集
         object_set = self.object_set_service.get_base_object_set(self.employee_type)
 
         # 验证对象集
-        assert len(object_set.all()) == 1
-        assert object_set.all()[0].primary_key_value == "emp001"
+        objs = object_set.all()
+        assert len(objs) == 1
+        assert objs[0].primary_key_value == "emp001"
         assert object_set.object_type == self.employee_type
 
-    def test_ontology_action_service_integration(self):
+    def test_ontology_action_service_integration(self, frozen_time_uuid, monkeypatch, manager):
         """测试Ontology与ActionService的集成"""
-        principal = Principal("manager", "manager")
-
         # 创建动作逻辑
         def hire_logic(context, **kwargs):
             # 在上下文中创建新员工对象
             context.create_object("employee", kwargs["name"], kwargs)
 
-        self.hire_action.logic = hire_logic
+        monkeypatch.setattr(self.hire_action, "logic", hire_logic)
 
         # 执行动作
-        with patch('time.time', return_value=1234567890):
-            with patch('uuid.uuid4', return_value='action-uuid-123'):
-                log = self.action_service.execute_action(
-                    "hire_employee",
-                    {
-                        "name": "Bob",
-                        "department": "Finance",
-                        "salary": "80000"
-                    },
-                    principal
-                )
+        log = self.action_service.execute_action(
+            "hire_employee",
+            {
+                "name": "Bob",
+                "department": "Finance",
+                "salary": "80000"
+            },
+            manager
+        )
 
         # 验证动作执行
         assert log.action_type_api_name == "hire_employee"
@@ -125,73 +175,32 @@ class TestCoreServicesIntegration:
         assert log.parameters["name"] == "Bob"
         assert log.changes is not None
 
-    def test_services_search_integration(self):
+    def test_services_search_integration(self, sample_employees):
         """测试服务模块搜索功能的集成"""
-        # 创建多个员工
-        employees = [
-            ObjectInstance(
-                object_type_api_name="employee",
-                primary_key_value="emp001",
-                property_values={
-                    "id": "emp001",
-                    "name": "Alice Johnson",
-                    "department": "Engineering",
-                    "salary": "100000"
-                }
-            ),
-            ObjectInstance(
-                object_type_api_name="employee",
-                primary_key_value="emp002",
-                property_values={
-                    "id": "emp002",
-                    "name": "Bob Smith",
-                    "department": "Finance",
-                    "salary": "80000"
-                }
-            ),
-            ObjectInstance(
-                object_type_api_name="employee",
-                primary_key_value="emp003",
-                property_values={
-                    "id": "emp003",
-                    "name": "Charlie Brown",
-                    "department": "Engineering",
-                    "salary": "90000"
-                }
-            )
-        ]
-
         # 索引所有员工
-        for emp in employees:
-            self.object_set_service.index_object(emp)
+        self.object_set_service.index_objects(sample_employees)
 
         # 测试搜索功能
         engineering_results = self.object_set_service.search(self.employee_type, "Engineering")
         assert len(engineering_results.all()) == 2
 
-        alice_results = self.object_set_service.search(self.employee_type, "Alice")
-        assert len(alice_results.all()) == 1
-        assert alice_results.all()[0].property_values["name"] == "Alice Johnson"
+        alice_results = self.object_set_service.search(self.employee_type, "Alice").all()
+        assert len(alice_results) == 1
+        assert alice_results[0].property_values["name"] == "Alice Johnson"
+
+        # 子串匹配语义保持不变
+        assert len(self.object_set_service.search(self.employee_type, "ngine").all()) == 2
+        assert len(self.object_set_service.search(self.employee_type, "smith\x0080000").all()) == 0
 
-    def test_permissions_integration(self):
+    def test_permissions_integration(self, monkeypatch, sample_employees):
         """测试权限系统集成"""
         # 设置权限
         acl = AccessControlList()
         acl.grant("hr_manager", PermissionType.VIEW)
         acl.grant("hr_manager", PermissionType.EDIT)
-        self.employee_type.permissions = acl
+        monkeypatch.setattr(self.employee_type, "permissions", acl)
 
-        # 创建员工
-        employee = ObjectInstance(
-            object_type_api_name="employee",
-            primary_key_value="emp001",
-            property_values={
-                "id": "emp001",
-                "name": "Alice",
-                "department": "HR"
-            }
-        )
-        self.object_set_service.index_object(employee)
+        self.object_set_service.index_object(sample_employees[0])
 
         # 测试有权限的用户
         object_set = self.object_set_service.get_base_object_set(
@@ -211,34 +220,43 @@ class TestCoreServicesIntegration:
 class TestApplicationsServicesIntegration:
     """测试应用层与服务层的集成"""
 
-    def setup_method(self):
-        """每个测试前的设置"""
-        self.ontology = Ontology()
-        self.object_set_service = ObjectSetService()
-        self.explorer = ObjectExplorer()
+    @pytest.fixture(scope="class", autouse=True)
+    def world(self, request):
+        """本体和产品类型每个测试类只构建一次"""
+        cls = request.cls
+        cls.ontology = Ontology()
 
         # 创建产品对象类型
-        self.product_type = ObjectType(
+        cls.product_type = ObjectType(
             api_name="product",
             display_name="Product",
             primary_key="id"
         )
-        self.product_type.add_property("id", PropertyType.STRING)
-        self.product_type.add_property("name", PropertyType.STRING)
-        self.product_type.add_property("price", PropertyType.STRING)
-        self.product_type.add_property("category", PropertyType.STRING)
-
-        self.ontology.register_object_type(self.product_type)
-
-        # 创建产品视图
-        self.product_view = ObjectView(
-            object_type=self.product_type,
+        cls.product_type.add_properties({
+            "id": PropertyType.STRING,
+            "name": PropertyType.STRING,
+            "price": PropertyType.STRING,
+            "category": PropertyType.STRING,
+        })
+
+        cls.ontology.register_object_type(cls.product_type)
+
+    @pytest.fixture(scope="class")
+    def explorer_with_product(self, request, world):
+        """注册好产品视图的探索器；open 不修改已注册视图，可在类内共享"""
+        explorer = ObjectExplorer()
+        explorer.register_view(ObjectView(
+            object_type=request.cls.product_type,
             title="产品列表视图",
             widgets=["表格", "价格图表", "分类过滤器"]
-        )
-        self.explorer.register_view(self.product_view)
+        ))
+        return explorer
+
+    def setup_method(self):
+        """每个测试使用独立的服务实例"""
+        self.object_set_service = ObjectSetService()
 
-    def test_object_explorer_service_integration(self):
+    def test_object_explorer_service_integration(self, capsys, explorer_with_product):
         """测试ObjectExplorer与ObjectSetService的集成"""
         # 创建产品数据
         products = [
@@ -265,18 +283,15 @@ class TestApplicationsServicesIntegration:
         ]
 
         # 索引产品
-        for product in products:
-            self.object_set_service.index_object(product)
+        self.object_set_service.index_objects(products)
 
         # 获取产品集
         product_set = self.object_set_service.get_base_object_set(self.product_type)
 
         # 使用探索器打开视图
-        captured_output = io.StringIO()
-        with patch('sys.stdout', captured_output):
-            self.explorer.open("product", product_set)
+        explorer_with_product.open("product", product_set)
 
-        output = captured_output.getvalue()
+        output = capsys.readouterr().out
 
         # 验证自定义视图被使用
         assert "--- Object View: 产品列表视图 ---" in output
@@ -284,34 +299,18 @@ class TestApplicationsServicesIntegration:
         assert "Total Objects: 2" in output
         assert "- [Widget] 表格" in output
 
-    def test_quiver_service_integration(self):
+    def test_quiver_service_integration(self, capsys, ten_products):
         """测试Quiver与ObjectSetService的集成"""
-        # 创建大量产品数据用于分析
-        products = []
-        for i in range(10):
-            product = ObjectInstance(
-                object_type_api_name="product",
-                primary_key_value=f"p{i:03d}",
-                property_values={
-                    "id": f"p{i:03d}",
-                    "name": f"Product {i}",
-                    "price": f"{i * 10}.99",
-                    "category": f"Category {i % 3}"
-                }
-            )
-            products.append(product)
-            self.object_set_service.index_object(product)
+        self.object_set_service.index_objects(ten_products)
 
         # 获取产品集
         product_set = self.object_set_service.get_base_object_set(self.product_type)
 
         # 使用Quiver分析
         quiver = Quiver()
-        captured_output = io.StringIO()
-        with patch('sys.stdout', captured_output):
-            quiver.analyze(product_set)
+        quiver.analyze(product_set)
 
-        output = captured_output.getvalue()
+        output = capsys.readouterr().out
 
         # 验证分析输出
         assert "--- Quiver Analysis ---" in output
@@ -322,112 +321,115 @@ class TestApplicationsServicesIntegration:
 class TestExceptionsServicesIntegration:
     """测试异常处理与服务模块的集成"""
 
-    def setup_method(self):
-        """每个测试前的设置"""
-        self.ontology = Ontology()
-        self.action_service = ActionService(self.ontology)
+    @pytest.fixture(scope="class", autouse=True)
+    def world(self, request):
+        """本体、用户类型和创建动作每个测试类只构建一次"""
+        cls = request.cls
+        cls.ontology = Ontology()
 
         # 创建测试对象类型
-        self.user_type = ObjectType(
+        cls.user_type = ObjectType(
             api_name="user",
             display_name="User",
             primary_key="id"
         )
-        self.user_type.add_property("id", PropertyType.STRING)
-        self.user_type.add_property("email", PropertyType.STRING)
+        cls.user_type.add_properties({
+            "id": PropertyType.STRING,
+            "email": PropertyType.STRING,
+        })
 
-        self.ontology.register_object_type(self.user_type)
+        cls.ontology.register_object_type(cls.user_type)
 
         # 创建测试动作类型
-        self.create_user_action = ActionType(
+        cls.create_user_action = ActionType(
             api_name="create_user",
             display_name="Create User",
             target_object_types=["user"]
         )
-        self.create_user_action.add_parameter("email", "string", required=True)
-        self.create_user_action.add_parameter("name", "string", required=True)
+        cls.create_user_action.add_parameter("email", "string", required=True)
+        cls.create_user_action.add_parameter("name", "string", required=True)
 
-        self.ontology.register_action_type(self.create_user_action)
+        cls.ontology.register_action_type(cls.create_user_action)
 
-    def test_action_service_error_handling(self):
-        """测试ActionService中的错误处理"""
-        principal = Principal("admin", "admin")
+    def setup_method(self):
+        """每个测试使用独立的服务实例"""
+        self.action_service = ActionService(self.ontology)
 
+    def test_action_service_error_handling(self, admin):
+        """测试ActionService中的错误处理"""
         # 测试找不到动作类型的错误
-        with pytest.raises(ValueError) as exc_info:
-            self.action_service.execute_action("nonexistent_action", {}, principal)
-
-        assert "Action type nonexistent_action not found" in str(exc_info.value)
+        with pytest.raises(ValueError, match="Action type nonexistent_action not found"):
+            self.action_service.execute_action("nonexistent_action", {}, admin)
 
         # 测试缺少必需参数的错误
-        with pytest.raises(ValueError) as exc_info:
-            self.action_service.execute_action("create_user", {"email": "test@example.com"}, principal)
-
-        assert "Missing required parameter: name" in str(exc_info.value)
+        with pytest.raises(ValueError, match="Missing required parameter: name"):
+            self.action_service.execute_action("create_user", {"email": "test@example.com"}, admin)
 
-    def test_permission_error_integration(self):
+    def test_permission_error_integration(self, monkeypatch, unauthorized_user):
         """测试权限错误的集成"""
         # 设置权限
         acl = AccessControlList()
         acl.grant("admin", PermissionType.EDIT)
-        self.create_user_action.permissions = acl
+        monkeypatch.setattr(self.create_user_action, "permissions", acl)
 
         # 测试权限不足的用户
-        unauthorized_user = Principal("user", "user")
-        with pytest.raises(PermissionError) as exc_info:
+        with pytest.raises(
+            PermissionError,
+            match="^User user does not have permission to execute action create_user$",
+        ):
             self.action_service.execute_action(
                 "create_user",
                 {"email": "test@example.com", "name": "Test User"},
                 unauthorized_user
             )
 
-        assert "does not have permission to execute action create_user" in str(exc_info.value)
-        assert "user" in str(exc_info.value)
-
 
 class TestLoggingServicesIntegration:
     """测试日志系统与服务模块的集成"""
 
-    def setup_method(self):
-        """每个测试前的设置"""
-        self.ontology = Ontology()
-        self.action_service = ActionService(self.ontology)
-        self.logger = get_logger("integration_test")
+    @pytest.fixture(scope="class", autouse=True)
+    def world(self, request):
+        """本体、任务类型和创建动作每个测试类只构建一次"""
+        cls = request.cls
+        cls.ontology = Ontology()
+        cls.logger = get_logger("integration_test")
 
         # 创建测试对象类型
-        self.task_type = ObjectType(
+        cls.task_type = ObjectType(
             api_name="task",
             display_name="Task",
             primary_key="id"
         )
-        self.task_type.add_property("id", PropertyType.STRING)
-        self.task_type.add_property("title", PropertyType.STRING)
+        cls.task_type.add_properties({
+            "id": PropertyType.STRING,
+            "title": PropertyType.STRING,
+        })
 
-        self.ontology.register_object_type(self.task_type)
+        cls.ontology.register_object_type(cls.task_type)
 
         # 创建测试动作
-        self.create_task_action = ActionType(
+        cls.create_task_action = ActionType(
             api_name="create_task",
             display_name="Create Task",
             target_object_types=["task"]
         )
-        self.create_task_action.add_parameter("title", "string", required=True)
+        cls.create_task_action.add_parameter("title", "string", required=True)
 
-        self.ontology.register_action_type(self.create_task_action)
+        cls.ontology.register_action_type(cls.create_task_action)
 
-    def test_action_service_logging(self):
-        """测试ActionService的日志集成"""
-        principal = Principal("manager", "manager")
+    def setup_method(self):
+        """每个测试使用独立的服务实例"""
+        self.action_service = ActionService(self.ontology)
 
+    def test_action_service_logging(self, frozen_time_uuid, manager):
+        """测试ActionService的日志集成"""
         # 使用日志上下文执行动作
         with LoggingContext(user_id="manager", operation="create_task"):
-            with patch('time.time', return_value=1234567890):
-                with patch('uuid.uuid4', return_value='task-uuid-123'):
-                    log = self.action_service.execute_action(
-                        "create_task",
-                        {"title": "Complete integration test"},
-                        principal
-                    )
+            log = self.action_service.execute_action(
+                "create_task",
+                {"title": "Complete integration test"},
+                manager
+            )
 
         # 验证日志记录
         assert log.action_type_api_name == "create_task"
@@ -446,20 +448,31 @@ class TestLoggingServicesIntegration:
             }
         )
 
-        # 使用日志上下文索引对象
-        with LoggingContext(operation="index_object"):
-            self.object_set_service = ObjectSetService()
-            self.object_set_service.index_object(task)
+        self.object_set_service = ObjectSetService()
+        self.object_set_service.index_object(task)
 
         # 验证对象被索引
         object_set = self.object_set_service.get_base_object_set(self.task_type)
         assert len(object_set.all()) == 1
 
+    def test_logging_context_captures_operation(self, caplog):
+        """测试LoggingContext把operation写入上下文内的日志记录"""
+        with caplog.at_level(logging.INFO):
+            with LoggingContext(operation="index_object"):
+                self.logger.info("indexing task")
+            self.logger.info("outside context")
+
+        events = [json.loads(record.getMessage()) for record in caplog.records]
+        inside = next(e for e in events if e["event"] == "indexing task")
+        outside = next(e for e in events if e["event"] == "outside context")
+        assert inside["operation"] == "index_object"
+        assert "operation" not in outside
+
 
 class TestFullWorkflowIntegration:
     """完整工作流集成测试"""
 
-    def test_complete_employee_management_workflow(self):
+    def test_complete_employee_management_workflow(self, frozen_time_uuid, capsys, hr_manager):
         """测试完整的员工管理工作流"""
         # 1. 初始化系统
         ontology = Ontology()
@@ -474,10 +487,12 @@ class TestFullWorkflowIntegration:
             display_name="Employee",
             primary_key="id"
         )
-        employee_type.add_property("id", PropertyType.STRING)
-        employee_type.add_property("name", PropertyType.STRING)
-        employee_type.add_property("department", PropertyType.STRING)
-        employee_type.add_property("position", PropertyType.STRING)
+        employee_type.add_properties({
+            "id": PropertyType.STRING,
+            "name": PropertyType.STRING,
+            "department": PropertyType.STRING,
+            "position": PropertyType.STRING,
+        })
 
         ontology.register_object_type(employee_type)
 
@@ -499,34 +514,32 @@ class TestFullWorkflowIntegration:
         hire_action.add_parameter("department", "string", required=True)
         hire_action.add_parameter("position", "string", required=True)
 
+        _emp_seq = itertools.count()
+
         def hire_logic(context, **kwargs):
-            # 模拟招聘逻辑：创建员工记录
-            emp_id = f"emp_{int(time.time())}"
+            # 模拟招聘逻辑：创建员工记录，编号只需唯一
+            emp_id = f"emp_{next(_emp_seq)}"
             context.create_object("employee", emp_id, kwargs)
 
         hire_action.logic = hire_logic
         ontology.register_action_type(hire_action)
 
         # 5. 执行招聘动作
-        hr_manager = Principal("hr_manager", "hr")
-
-        with patch('time.time', return_value=1234567890):
-            with patch('uuid.uuid4', return_value='hire-uuid-123'):
-                hire_log = action_service.execute_action(
-                    "hire_employee",
-                    {
-                        "name": "John Doe",
-                        "department": "Engineering",
-                        "position": "Software Engineer"
-                    },
-                    hr_manager
-                )
+        hire_log = action_service.execute_action(
+            "hire_employee",
+            {
+                "name": "John Doe",
+                "department": "Engineering",
+                "position": "Software Engineer"
+            },
+            hr_manager
+        )
 
         # 6. 验证动作执行结果
         assert hire_log.action_type_api_name == "hire_employee"
         assert hire_log.user_id == "hr_manager"
         assert hire_log.parameters["name"] == "John Doe"
-        assert hire_log.changes is not None
+        assert hire_log.changes == ["Created object employee with PK emp_0"]
 
         # 7. 创建实际员工对象用于演示
         employee = ObjectInstance(
@@ -547,25 +560,23 @@ class TestFullWorkflowIntegration:
         employee_set = object_service.get_base_object_set(employee_type)
 
         # 10. 使用视图展示员工
-        captured_output = io.StringIO()
-        with patch('sys.stdout', captured_output):
-            explorer.open("employee", employee_set)
+        capsys.readouterr()
+        explorer.open("employee", employee_set)
 
-        view_output = captured_output.getvalue()
+        view_output = capsys.readouterr().out
         assert "--- Object View: 员工管理视图 ---" in view_output
         assert "Object Type: Employee" in view_output
         assert "Total Objects: 1" in view_output
 
         # 11. 使用Quiver分析员工数据
-        analysis_output = io.StringIO()
-        with patch('sys.stdout', analysis_output):
-            quiver.analyze(employee_set)
+        quiver.analyze(employee_set)
 
-        analysis_result = analysis_output.getvalue()
+        analysis_result = capsys.readouterr().out
         assert "--- Quiver Analysis ---" in analysis_result
         assert "Analyzing 1 objects of type employee" in analysis_result
 
         # 12. 验证整个工作流完成
-        assert len(employee_set.all()) == 1
-        assert employee_set.all()[0].property_values["name"] == "John Doe"
-        assert employee_set.all()[0].property_values["department"] == "Engineering"
\ No newline at end of file
+        employees = employee_set.all()
+        assert len(employees) == 1
+        assert employees[0].property_values["name"] == "John Doe"
+        assert employees[0].property_values["department"] == "Engineering"
\ No newline at end of file
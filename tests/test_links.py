@@ -1,4 +1,7 @@
-import unittest
+import contextlib
+from operator import attrgetter
+
+import pytest
 
 from ontology_framework import (
     LinkType,
@@ -8,131 +11,157 @@ from ontology_framework import (
     Ontology,
     PropertyType,
 )
+from ontology_framework.core import InMemoryLinkStore
 
 
-class TestLinks(unittest.TestCase):
-    def setUp(self):
-        self.ontology = Ontology()
+@pytest.fixture(scope="module")
+def base_ontology():
+    ontology = Ontology()
 
-        # Define Types
-        factory = ObjectType(
-            api_name="Factory", display_name="Factory", primary_key="id"
-        )
-        factory.add_property("id", PropertyType.STRING)
+    # Define Types
+    factory = ObjectType(api_name="Factory", display_name="Factory", primary_key="id")
+    factory.add_property("id", PropertyType.STRING)
 
-        equipment = ObjectType(
-            api_name="Equipment", display_name="Equipment", primary_key="id"
-        )
-        equipment.add_property("id", PropertyType.STRING)
+    equipment = ObjectType(
+        api_name="Equipment", display_name="Equipment", primary_key="id"
+    )
+    equipment.add_property("id", PropertyType.STRING)
 
-        self.ontology.register_object_type(factory)
-        self.ontology.register_object_type(equipment)
+    ontology.register_object_type(factory)
+    ontology.register_object_type(equipment)
 
-        link_type = LinkType(
-            api_name="FactoryHasEquipment",
-            display_name="Factory Has Equipment",
-            source_object_type="Factory",
-            target_object_type="Equipment",
-        )
-        self.ontology.register_link_type(link_type)
-
-        # Create Objects
-        f1 = ObjectInstance("Factory", "f1", {"id": "f1"})
-        f2 = ObjectInstance("Factory", "f2", {"id": "f2"})
-        e1 = ObjectInstance("Equipment", "e1", {"id": "e1"})
-        e2 = ObjectInstance("Equipment", "e2", {"id": "e2"})
-        e3 = ObjectInstance("Equipment", "e3", {"id": "e3"})
-
-        self.ontology.add_object(f1)
-        self.ontology.add_object(f2)
-        self.ontology.add_object(e1)
-        self.ontology.add_object(e2)
-        self.ontology.add_object(e3)
-
-    def test_create_and_get_links(self):
-        # Create links: f1 -> e1, f1 -> e2
-        self.ontology.create_link("FactoryHasEquipment", "f1", "e1")
-        self.ontology.create_link("FactoryHasEquipment", "f1", "e2")
-
-        links = self.ontology.get_all_links()
-        self.assertEqual(len(links), 2)
-        self.assertEqual(links[0].source_primary_key, "f1")
-        self.assertEqual(links[0].target_primary_key, "e1")
-
-    def test_search_around(self):
-        # Setup links
-        self.ontology.create_link("FactoryHasEquipment", "f1", "e1")
-        self.ontology.create_link("FactoryHasEquipment", "f1", "e2")
-        self.ontology.create_link("FactoryHasEquipment", "f2", "e3")
-
-        # Start with Factory f1
-        f1_obj = self.ontology.get_objects_of_type("Factory")[0]  # f1 is first added
-        # Ensure we got f1
-        if f1_obj.primary_key_value != "f1":
-            f1_obj = [
-                o
-                for o in self.ontology.get_objects_of_type("Factory")
-                if o.primary_key_value == "f1"
-            ][0]
-
-        start_set = ObjectSet(
-            self.ontology.get_object_type("Factory"), [f1_obj], self.ontology
-        )
+    link_type = LinkType(
+        api_name="FactoryHasEquipment",
+        display_name="Factory Has Equipment",
+        source_object_type="Factory",
+        target_object_type="Equipment",
+    )
+    ontology.register_link_type(link_type)
+
+    # Create Objects
+    f1 = ObjectInstance("Factory", "f1", {"id": "f1"})
+    f2 = ObjectInstance("Factory", "f2", {"id": "f2"})
+    e1 = ObjectInstance("Equipment", "e1", {"id": "e1"})
+    e2 = ObjectInstance("Equipment", "e2", {"id": "e2"})
+    e3 = ObjectInstance("Equipment", "e3", {"id": "e3"})
+
+    ontology.add_object(f1)
+    ontology.add_object(f2)
+    ontology.add_object(e1)
+    ontology.add_object(e2)
+    ontology.add_object(e3)
+    return ontology
+
+
+@pytest.fixture
+def ontology(base_ontology):
+    # Types and objects are shared; only links are test-local
+    yield base_ontology
+    base_ontology.set_link_store(InMemoryLinkStore())
+
+
+def test_create_and_get_links(ontology):
+    # Create links: f1 -> e1, f1 -> e2
+    ontology.create_link("FactoryHasEquipment", "f1", "e1")
+    ontology.create_link("FactoryHasEquipment", "f1", "e2")
+
+    links = ontology.get_all_links()
+    assert len(links) == 2
+    assert links[0].source_primary_key == "f1"
+    assert links[0].target_primary_key == "e1"
+
+
+def test_get_links_by_type(ontology):
+    ontology.create_link("FactoryHasEquipment", "f1", "e1")
+    ontology.create_link("FactoryHasEquipment", "f2", "e3")
+    ontology.create_link("FactoryHasEquipment", "f1", "e1")  # duplicate is ignored
+
+    links = ontology.get_links("FactoryHasEquipment")
+    assert [(l.source_primary_key, l.target_primary_key) for l in links] == [
+        ("f1", "e1"),
+        ("f2", "e3"),
+    ]
+    assert ontology.get_links("UnknownLink") == []
 
-        # Search around to Equipment
-        result_set = start_set.search_around("FactoryHasEquipment")
-
-        self.assertEqual(result_set.object_type.api_name, "Equipment")
-        results = result_set.all()
-        self.assertEqual(len(results), 2)
-        pks = {obj.primary_key_value for obj in results}
-        self.assertIn("e1", pks)
-        self.assertIn("e2", pks)
-        self.assertNotIn("e3", pks)
-
-    def test_search_around_invalid_link(self):
-        f1_obj = self.ontology.get_objects_of_type("Factory")[0]
-        start_set = ObjectSet(
-            self.ontology.get_object_type("Factory"), [f1_obj], self.ontology
+    ontology.delete_link("FactoryHasEquipment", "f1", "e1")
+    assert ontology.get_links("FactoryHasEquipment") == ontology.get_all_links()
+    assert len(ontology.get_all_links()) == 1
+
+
+def test_search_around(ontology):
+    # Setup links
+    ontology.create_link("FactoryHasEquipment", "f1", "e1")
+    ontology.create_link("FactoryHasEquipment", "f1", "e2")
+    ontology.create_link("FactoryHasEquipment", "f2", "e3")
+
+    # Start with Factory f1
+    factories = ontology.get_objects_of_type("Factory")
+    f1_obj = next(o for o in factories if o.primary_key_value == "f1")
+
+    start_set = ObjectSet(ontology.get_object_type("Factory"), [f1_obj], ontology)
+
+    # Search around to Equipment
+    result_set = start_set.search_around("FactoryHasEquipment")
+
+    assert result_set.object_type.api_name == "Equipment"
+    results = result_set.all()
+    assert len(results) == 2
+    pks = set(map(attrgetter("primary_key_value"), results))
+    assert "e1" in pks
+    assert "e2" in pks
+    assert "e3" not in pks
+
+
+def test_search_around_invalid_link(ontology):
+    f1_obj = ontology.get_objects_of_type("Factory")[0]
+    start_set = ObjectSet(ontology.get_object_type("Factory"), [f1_obj], ontology)
+
+    with pytest.raises(ValueError, match="Link type InvalidLink not found"):
+        start_set.search_around("InvalidLink")
+
+
+_LINK_PERMISSION_CASES = [
+    (["EDIT_LINK_FactoryHasEquipment"], False),
+    (["SOME_OTHER_PERM"], True),
+]
+
+
+def _permission_check(should_raise):
+    if should_raise:
+        return pytest.raises(
+            PermissionError, match="Missing permission: EDIT_LINK_FactoryHasEquipment"
         )
+    return contextlib.nullcontext()
 
-        with self.assertRaisesRegex(ValueError, "Link type InvalidLink not found"):
-            start_set.search_around("InvalidLink")
 
-    def test_permissions(self):
-        # Test with valid permission
-        self.ontology.create_link(
-            "FactoryHasEquipment",
-            "f1",
-            "e1",
-            user_permissions=["EDIT_LINK_FactoryHasEquipment"],
+@pytest.mark.parametrize("user_perms,should_raise", _LINK_PERMISSION_CASES)
+def test_link_create_permissions(ontology, user_perms, should_raise):
+    with _permission_check(should_raise):
+        ontology.create_link(
+            "FactoryHasEquipment", "f1", "e1", user_permissions=user_perms
         )
+    assert len(ontology.get_all_links()) == (0 if should_raise else 1)
 
-        # Test with missing permission
-        with self.assertRaisesRegex(
-            PermissionError, "Missing permission: EDIT_LINK_FactoryHasEquipment"
-        ):
-            self.ontology.create_link(
-                "FactoryHasEquipment", "f1", "e2", user_permissions=["SOME_OTHER_PERM"]
-            )
-
-        # Test delete with missing permission
-        with self.assertRaisesRegex(
-            PermissionError, "Missing permission: EDIT_LINK_FactoryHasEquipment"
-        ):
-            self.ontology.delete_link(
-                "FactoryHasEquipment", "f1", "e1", user_permissions=["SOME_OTHER_PERM"]
-            )
-
-        # Test delete with valid permission
-        self.ontology.delete_link(
-            "FactoryHasEquipment",
-            "f1",
-            "e1",
-            user_permissions=["EDIT_LINK_FactoryHasEquipment"],
+
+@pytest.mark.parametrize("user_perms,should_raise", _LINK_PERMISSION_CASES)
+def test_link_delete_permissions(ontology, user_perms, should_raise):
+    ontology.create_link("FactoryHasEquipment", "f1", "e1")
+    with _permission_check(should_raise):
+        ontology.delete_link(
+            "FactoryHasEquipment", "f1", "e1", user_permissions=user_perms
         )
-        self.assertEqual(len(self.ontology.get_all_links()), 0)
+    assert len(ontology.get_all_links()) == (1 if should_raise else 0)
+
+
+def test_get_objects_bulk_lookup(ontology):
+    objs = ontology.get_objects("Equipment", ["e2", "missing", "e1"])
+    assert [o.primary_key_value if o else None for o in objs] == ["e2", None, "e1"]
+    assert objs[0]._ontology is ontology
+    assert ontology.get_objects("UnknownType", ["e1"]) == [None]
 
 
-if __name__ == "__main__":
-    unittest.main()
+def test_contains_object(ontology):
+    assert ontology.contains_object("Equipment", "e1")
+    assert not ontology.contains_object("Equipment", "missing")
+    assert not ontology.contains_object("Factory", "e1")
+    assert not ontology.contains_object("UnknownType", "e1")
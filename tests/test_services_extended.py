@@ -98,6 +98,27 @@ class TestObjectSetServiceExtended:
         assert len(alice_objects) == 1
         assert alice_objects[0] == self.test_obj1
 
+    def test_filter_by_uses_index(self):
+        """测试按属性精确过滤走索引"""
+        self.service.index_objects([self.test_obj1, self.test_obj2, self.test_obj3])
+
+        assert self.service.filter_by(self.test_object_type, "name", "Bob").all() == (self.test_obj2,)
+        assert self.service.filter_by(self.test_object_type, "name", "Nobody").all() == ()
+        assert self.service.filter_by(self.test_object_type, "missing", "x").all() == ()
+
+    def test_index_objects_bulk(self):
+        """测试批量索引与逐个索引结果一致"""
+        objects = [self.test_obj1, self.test_obj2, self.test_obj3]
+        single = ObjectSetService()
+        for obj in objects:
+            single.index_object(obj)
+
+        self.service.index_objects(objects)
+
+        assert self.service._storage == single._storage
+        assert self.service._index == single._index
+        assert self.service.search(self.test_object_type, "example.org").all()[0] == self.test_obj3
+
     def test_index_objects_with_same_property_values(self):
         """测试具有相同属性值的对象索引"""
         # 创建具有相同名称的对象